@@ -32,24 +32,30 @@ Enhanced Features:
 from __future__ import annotations
 import asyncio
 import base64
+import functools
 import hashlib
 import json
 import os
 import secrets
 import struct
+import sys
 import time
 import zlib
-from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from collections import Counter, OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from binascii import b2a_base64
 from datetime import datetime, timedelta
 from enum import Enum, IntEnum
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
+from heapq import nsmallest
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple, Union
 
+import numpy as np
 import uvicorn
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse
-from pydantic import BaseModel, Field, field_validator, model_validator
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 from starlette.websockets import WebSocketState
 
 # Optional Redis import - only if persistence is enabled
@@ -59,6 +65,48 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+# Optional ISA-L import - SIMD CRC32, falls back to zlib
+try:
+    from isal import isal_zlib as _crc_impl
+    ISAL_AVAILABLE = True
+except ImportError:
+    _crc_impl = zlib
+    ISAL_AVAILABLE = False
+
+# Optional pybase64 import - SIMD base64 decode, falls back to stdlib
+try:
+    import pybase64
+    _b64decode = pybase64.b64decode
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    _b64decode = base64.b64decode
+    PYBASE64_AVAILABLE = False
+
+# Optional Numba import - JIT CRC32 kernel for batch endpoints
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional msgpack import - binary WebSocket control channel (prefers ormsgpack)
+try:
+    import ormsgpack as _msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    try:
+        import msgpack as _msgpack
+        MSGPACK_AVAILABLE = True
+    except ImportError:
+        MSGPACK_AVAILABLE = False
+
+# Optional orjson import - falls back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================
 # CONFIGURATION
 # ============================================
@@ -72,10 +120,14 @@ class Config:
     RATE_LIMIT_MESSAGES = 100
     RATE_LIMIT_WINDOW = 60
     WEBSOCKET_HEARTBEAT = 30
+    WEBSOCKET_SEND_QUEUE = 64  # Pending pushes per client outbox before it is dropped as slow
+    MAX_BATCH_SIZE = 1000
     ENABLE_PERSISTENCE = os.getenv("NLC9_ENABLE_PERSISTENCE", "false").lower() == "true"
     REDIS_URL = os.getenv("NLC9_REDIS_URL", "redis://localhost:6379")
     ENABLE_METRICS = os.getenv("NLC9_ENABLE_METRICS", "true").lower() == "true"
     DEBUG_MODE = os.getenv("NLC9_DEBUG", "false").lower() == "true"
+    # 36-byte frames don't compress; deflate only costs CPU and per-socket memory
+    WS_PER_MESSAGE_DEFLATE = os.getenv("NLC9_WS_DEFLATE", "false").lower() == "true"
 
 config = Config()
 
@@ -99,6 +151,10 @@ class Flags(IntEnum):
 
 FLAG_BITS = {flag.name: flag.value for flag in Flags}
 
+# Precomputed (name, mask) pairs for flag encode/decode
+_FLAG_MASKS: List[Tuple[str, int]] = [(name, 1 << pos) for name, pos in FLAG_BITS.items()]
+_FLAG_MASK_BY_NAME: Dict[str, int] = dict(_FLAG_MASKS)
+
 # Extended verb registry for trading
 SEEDED_VERBS = {
     # Core verbs
@@ -161,23 +217,115 @@ OBJECTS: Dict[str, int] = dict(SEEDED_OBJECTS)
 REV_VERBS: Dict[int, str] = {v: k for k, v in VERBS.items()}
 REV_OBJECTS: Dict[int, str] = {v: k for k, v in OBJECTS.items()}
 
+# Direct-indexed reverse tables for the small seeded ID range
+_REV_SMALL_SIZE = 64
+_REV_VERBS_SMALL: List[Optional[str]] = [None] * _REV_SMALL_SIZE
+_REV_OBJECTS_SMALL: List[Optional[str]] = [None] * _REV_SMALL_SIZE
+
+def sync_reverse_tables() -> None:
+    """Rebuild the reverse lookup tables from VERBS/OBJECTS."""
+    REV_VERBS.clear()
+    REV_VERBS.update({v: k for k, v in VERBS.items()})
+    REV_OBJECTS.clear()
+    REV_OBJECTS.update({v: k for k, v in OBJECTS.items()})
+    _REV_VERBS_SMALL[:] = [REV_VERBS.get(i) for i in range(_REV_SMALL_SIZE)]
+    _REV_OBJECTS_SMALL[:] = [REV_OBJECTS.get(i) for i in range(_REV_SMALL_SIZE)]
+
+sync_reverse_tables()
+
+def name_for_verb_id(verb_id: int) -> str:
+    """Reverse-lookup a verb name, falling back to a VERB#id label."""
+    if verb_id < _REV_SMALL_SIZE:
+        name = _REV_VERBS_SMALL[verb_id]
+        if name is not None:
+            return name
+    return REV_VERBS.get(verb_id, f"VERB#{verb_id}")
+
+def name_for_object_id(obj_id: int) -> str:
+    """Reverse-lookup an object name, falling back to an OBJECT#id label."""
+    if obj_id < _REV_SMALL_SIZE:
+        name = _REV_OBJECTS_SMALL[obj_id]
+        if name is not None:
+            return name
+    return REV_OBJECTS.get(obj_id, f"OBJECT#{obj_id}")
+
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
 
+_crc32 = _crc_impl.crc32
+
 def crc32_u32(data: bytes) -> int:
-    """Calculate CRC32 and mask to uint32."""
-    return zlib.crc32(data) & config.UINT32_MASK
+    """Calculate CRC32 as uint32 (both backends return unsigned values)."""
+    return _crc32(data)
 
+@functools.lru_cache(maxsize=4096)
 def token_id(name: str) -> int:
-    """Generate deterministic 32-bit ID from string."""
+    """Generate deterministic 32-bit ID from string (memoized per name)."""
     return crc32_u32(name.strip().lower().encode("utf-8"))
 
+def id_for_verb(name: str) -> int:
+    """Resolve verb name to its registered ID, hashing only unknown names."""
+    verb_id = VERBS.get(name.upper())
+    return verb_id if verb_id is not None else token_id(name)
+
+def id_for_object(name: str) -> int:
+    """Resolve object name to its registered ID, hashing only unknown names."""
+    obj_id = OBJECTS.get(name.upper())
+    return obj_id if obj_id is not None else token_id(name)
+
+@functools.lru_cache(maxsize=1024)
+def _domain_id16_cached(name: str) -> int:
+    return crc32_u32(name.strip().lower().encode("utf-8")) & 0xFFFF
+
 def domain_id16(name: Optional[str]) -> int:
     """Generate 16-bit domain ID."""
     if not name:
         return 0
-    return crc32_u32(name.strip().lower().encode("utf-8")) & 0xFFFF
+    return _domain_id16_cached(name)
+
+if ORJSON_AVAILABLE:
+    def json_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes (orjson fast path)."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return json.dumps(obj).encode("utf-8")
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize to a JSON string (orjson fast path)."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return json.dumps(obj)
+
+    json_loads = orjson.loads
+else:
+    def json_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode("utf-8")
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize to a JSON string."""
+        return json.dumps(obj)
+
+    json_loads = json.loads
+
+@functools.lru_cache(maxsize=4096)
+def resolve_ids(verb: str, obj: str, domain: Optional[str]) -> Tuple[int, int, int]:
+    """Resolve (verb_id, object_id, domain16) in one memoized call.
+
+    Call ``resolve_ids.cache_clear()`` after mutating VERBS or OBJECTS.
+    """
+    verb_id = VERBS.get(verb.upper())
+    if verb_id is None:
+        verb_id = token_id(verb)
+    obj_id = OBJECTS.get(obj.upper())
+    if obj_id is None:
+        obj_id = token_id(obj)
+    return verb_id, obj_id, domain_id16(domain)
 
 def pack_header(version: int, flags_bits: int, domain16: int) -> int:
     """Pack header components into single uint32."""
@@ -202,15 +350,21 @@ def flags_to_bits(flags: Optional[List[str]]) -> int:
     if not flags:
         return bits
     for f in flags:
-        f_up = f.strip().upper()
-        if f_up not in FLAG_BITS:
+        mask = _FLAG_MASK_BY_NAME.get(f.strip().upper())
+        if mask is None:
             raise ValueError(f"Unknown flag: {f}")
-        bits |= (1 << FLAG_BITS[f_up])
+        bits |= mask
     return bits
 
-def bits_to_flags(bits: int) -> List[str]:
-    """Convert bit field to flag names."""
-    return [name for name, pos in FLAG_BITS.items() if bits & (1 << pos)]
+# All 4096 possible 12-bit flag fields, decoded once at import time
+_FLAGS_TABLE: List[Tuple[str, ...]] = [
+    tuple(name for name, mask in _FLAG_MASKS if bits & mask)
+    for bits in range(1 << 12)
+]
+
+def bits_to_flags(bits: int) -> Tuple[str, ...]:
+    """Convert bit field to flag names (shared immutable tuple)."""
+    return _FLAGS_TABLE[bits & 0xFFF]
 
 def u32(n: int) -> int:
     """Mask to uint32."""
@@ -224,17 +378,97 @@ def from_fixed_u32(n: int, scale: int) -> float:
     """Convert fixed-point uint32 to float."""
     return (n & config.UINT32_MASK) / float(scale)
 
+# Pre-compiled wire layout: 9 big-endian uint32 limbs
+_S9 = struct.Struct(">9I")
+
 def pack9(nums: List[int]) -> bytes:
-    """Pack 9 uint32s into 36 bytes."""
+    """Pack 9 uint32s into 36 bytes (limbs must already be masked)."""
     if len(nums) != 9:
         raise ValueError("Need exactly 9 numbers")
-    return struct.pack(">9I", *[u32(v) for v in nums])
+    return _S9.pack(*nums)
+
+def _crc32_tables() -> np.ndarray:
+    """Slice-by-8 lookup tables for the reflected CRC32 (IEEE) polynomial."""
+    tables = np.zeros((8, 256), dtype=np.uint32)
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        tables[0, i] = c
+    for i in range(256):
+        for k in range(1, 8):
+            prev = int(tables[k - 1, i])
+            tables[k, i] = (prev >> 8) ^ int(tables[0, prev & 0xFF])
+    return tables
+
+if NUMBA_AVAILABLE:
+    _CRC32_TABLES = _crc32_tables()
+
+    @njit(cache=True, nogil=True)
+    def _crc32_rows_jit(rows, tables):
+        """Slice-by-8 CRC32 of each row of an (N, L) uint8 array."""
+        n, length = rows.shape
+        out = np.empty(n, dtype=np.uint32)
+        for r in range(n):
+            crc = np.uint32(0xFFFFFFFF)
+            i = 0
+            while i + 8 <= length:
+                one = crc ^ (np.uint32(rows[r, i]) | (np.uint32(rows[r, i + 1]) << 8)
+                             | (np.uint32(rows[r, i + 2]) << 16) | (np.uint32(rows[r, i + 3]) << 24))
+                crc = (tables[7, one & 0xFF] ^ tables[6, (one >> 8) & 0xFF]
+                       ^ tables[5, (one >> 16) & 0xFF] ^ tables[4, one >> 24]
+                       ^ tables[3, rows[r, i + 4]] ^ tables[2, rows[r, i + 5]]
+                       ^ tables[1, rows[r, i + 6]] ^ tables[0, rows[r, i + 7]])
+                i += 8
+            while i < length:
+                crc = (crc >> 8) ^ tables[0, (crc ^ rows[r, i]) & 0xFF]
+                i += 1
+            out[r] = crc ^ np.uint32(0xFFFFFFFF)
+        return out
+
+def crc32_frames(frames: np.ndarray) -> np.ndarray:
+    """CRC32 of every 36-byte row of an (N, 9) '>u4' array whose checksum column is zero."""
+    wire = np.ascontiguousarray(frames, dtype=">u4")
+    if NUMBA_AVAILABLE:
+        return _crc32_rows_jit(wire.view(np.uint8).reshape(-1, 36), _CRC32_TABLES)
+    raw = memoryview(wire.tobytes())
+    return np.fromiter(
+        (_crc32(raw[i:i + 36]) for i in range(0, len(raw), 36)),
+        dtype=np.uint32,
+        count=len(frames),
+    )
+
+def frames_from_bytes(b: bytes) -> np.ndarray:
+    """View concatenated 36-byte frames as an (N, 9) '>u4' array."""
+    if not b or len(b) % 36:
+        raise ValueError("Need a non-empty multiple of 36 bytes")
+    return np.frombuffer(b, dtype=">u4").reshape(-1, 9)
+
+def b64_str(b: bytes) -> str:
+    """Base64-encode bytes to str without the intermediate b64encode copy."""
+    return b2a_base64(b, newline=False).decode("ascii")
+
+def b64_frame(text: str) -> bytes:
+    """Decode a base64 36-byte frame, rejecting wrong lengths before decoding."""
+    text = text.strip()
+    if len(text) != 48:
+        raise ValueError("Need exactly 36 bytes")
+    return _b64decode(text)
 
 def unpack9(b: bytes) -> List[int]:
     """Unpack 36 bytes into 9 uint32s."""
     if len(b) != 36:
         raise ValueError("Need exactly 36 bytes")
-    return list(struct.unpack(">9I", b))
+    return list(_S9.unpack(b))
+
+_CRC_ZERO = bytes(4)
+
+def decode9(b: bytes) -> Tuple[List[int], bool]:
+    """Unpack a 36-byte frame and verify its CRC in one pass; returns (limbs, checksum_ok)."""
+    if len(b) != 36:
+        raise ValueError("Need exactly 36 bytes")
+    nums = list(_S9.unpack(b))
+    return nums, _crc32(b[:32] + _CRC_ZERO) == nums[8]
 
 # ============================================
 # ENHANCED SCHEMA SYSTEM
@@ -276,6 +510,130 @@ class SchemaRegistration(BaseModel):
 
 # Schema storage
 SCHEMAS: Dict[Tuple[int, int], SchemaRegistration] = {}
+# tag -> {(verb_id, object_id): schema}, maintained by install_schema
+TAG_INDEX: Dict[str, Dict[Tuple[int, int], SchemaRegistration]] = {}
+# Serialized per-tag listings, dropped whenever a schema is installed
+_TAG_RESPONSE_CACHE: Dict[str, bytes] = {}
+
+# Slot type codes used by the compiled schema tables
+TYPE_INT, TYPE_FLOAT, TYPE_BOOL, TYPE_PERCENT, TYPE_AMOUNT, TYPE_TOKEN = range(6)
+
+PARAM_TYPE_CODES: Dict[str, int] = {
+    "int": TYPE_INT,
+    "timestamp": TYPE_INT,
+    "float": TYPE_FLOAT,
+    "bool": TYPE_BOOL,
+    "percent": TYPE_PERCENT,
+    "amount": TYPE_AMOUNT,
+    "string": TYPE_TOKEN,
+    "id": TYPE_TOKEN,
+    "hash": TYPE_TOKEN,
+    "address": TYPE_TOKEN,
+}
+
+# Parallel per-slot arrays: (names, type_codes, scales, required, min_values, max_values)
+CompiledSchema = Tuple[
+    Tuple[str, ...], Tuple[int, ...], Tuple[int, ...],
+    Tuple[bool, ...], Tuple[Optional[float], ...], Tuple[Optional[float], ...],
+]
+
+# Specialized per-schema encoder/decoder functions generated at registration
+_SCHEMA_ENC_FN: Dict[Tuple[int, int], Any] = {}
+_SCHEMA_DEC_FN: Dict[Tuple[int, int], Any] = {}
+_SCHEMA_META: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+def compile_schema(schema: SchemaRegistration) -> CompiledSchema:
+    """Flatten ParamSpec models into parallel tuples for the codec hot path."""
+    specs = schema.params[:3]
+    return (
+        # Interned so lookups against JSON-parsed keys can hit on identity
+        tuple(sys.intern(spec.name) for spec in specs),
+        tuple(PARAM_TYPE_CODES[spec.type] for spec in specs),
+        tuple(spec.scale or 1_000_000 for spec in specs),
+        tuple(spec.required for spec in specs),
+        tuple(spec.min_value for spec in specs),
+        tuple(spec.max_value for spec in specs),
+    )
+
+# Source templates per type code; "v" is the param value, {x} the uint32 slot
+_ENC_EXPR = {
+    TYPE_INT: "_u32(int(v))",
+    TYPE_TOKEN: "_tok(str(v))",
+    TYPE_PERCENT: "_u32(int(float(v) * 10000))",
+    TYPE_AMOUNT: "_fixed(float(v), 1000000)",
+    TYPE_FLOAT: "_fixed(float(v), {scale})",
+    TYPE_BOOL: "1 if v else 0",
+}
+_DEC_EXPR = {
+    TYPE_INT: "{x}",
+    TYPE_TOKEN: "f'ID#{{{x}}}'",
+    TYPE_PERCENT: "{x} / 10000.0",
+    TYPE_AMOUNT: "{x} / 1000000.0",
+    TYPE_FLOAT: "({x} & 0xFFFFFFFF) / {fscale!r}",
+    TYPE_BOOL: "bool({x} & 1)",
+}
+
+def codegen_schema(compiled: CompiledSchema) -> Tuple[Any, Any]:
+    """Generate straight-line encode(params) and decode(a, b, c) functions for a schema.
+
+    Everything known at registration time (names, types, scales, bounds) is
+    inlined as literals, so the hot path has no loops or type dispatch.
+    """
+    names, codes, scales, required, mins, maxs = compiled
+    slot_vars = ("a", "b", "c")
+    
+    enc = ["def enc(p):"]
+    for i, name in enumerate(names):
+        x = slot_vars[i]
+        missing = f"Required parameter '{name}' missing"
+        too_low = f"Parameter '{name}' below minimum value"
+        too_high = f"Parameter '{name}' above maximum value"
+        enc.append(f"    v = p.get({name!r})")
+        enc.append("    if v is None:")
+        if required[i]:
+            enc.append(f"        raise ValueError({missing!r})")
+        else:
+            enc.append(f"        {x} = 0")
+        enc.append("    else:")
+        enc.append(f"        {x} = " + _ENC_EXPR[codes[i]].format(scale=scales[i]))
+        if mins[i] is not None:
+            enc.append(f"        if {x} < {mins[i]!r}: raise ValueError({too_low!r})")
+        if maxs[i] is not None:
+            enc.append(f"        if {x} > {maxs[i]!r}: raise ValueError({too_high!r})")
+    for x in slot_vars[len(names):]:
+        enc.append(f"    {x} = 0")
+    enc.append("    return a, b, c")
+    
+    items = ", ".join(
+        f"{name!r}: " + _DEC_EXPR[codes[i]].format(x=slot_vars[i], fscale=float(scales[i]))
+        for i, name in enumerate(names)
+    )
+    dec = ["def dec(a, b, c):", f"    return {{{items}}}"]
+    
+    namespace = {"_u32": u32, "_tok": token_id, "_fixed": to_fixed_u32}
+    exec("\n".join(enc + dec), namespace)
+    return namespace["enc"], namespace["dec"]
+
+def install_schema(key: Tuple[int, int], schema: SchemaRegistration) -> None:
+    """Register schema and its compiled slot tables and codec functions."""
+    compiled = compile_schema(schema)
+    previous = SCHEMAS.get(key)
+    if previous is not None:
+        for tag in previous.tags or ():
+            TAG_INDEX.get(tag, {}).pop(key, None)
+    SCHEMAS[key] = schema
+    for tag in schema.tags or ():
+        TAG_INDEX.setdefault(tag, {})[key] = schema
+    _TAG_RESPONSE_CACHE.clear()
+    _SCHEMA_ENC_FN[key], _SCHEMA_DEC_FN[key] = codegen_schema(compiled)
+    _SCHEMA_META[key] = {
+        "schema": {
+            "description": schema.description,
+            "tags": schema.tags,
+        }
+    }
+    # Cached static limbs were encoded under the previous schema
+    _static_limbs_cached.cache_clear()
 
 # ============================================
 # MESSAGE MODELS
@@ -294,25 +652,25 @@ class EncodeRequest(BaseModel):
     priority: Optional[int] = Field(default=5, ge=0, le=10)
     ttl: Optional[int] = Field(default=3600, description="Time to live in seconds")
 
+# Built once; validates plain dicts without a per-call EncodeRequest(**kwargs)
+_ENCODE_REQ_ADAPTER = TypeAdapter(EncodeRequest)
+
+EncodeFormat = Literal["all", "numbers", "b64", "hex"]
+
 class EncodeResponse(BaseModel):
     numbers: List[int]
-    base64: str
-    hex: str
+    base64: Optional[str] = None
+    hex: Optional[str] = None
     header: Dict[str, Any]
     metadata: Optional[Dict[str, Any]] = None
 
 class DecodeRequest(BaseModel):
+    # No Python-level validators on this hot-path model; the one-of check
+    # runs in the handler via require_one_input
     numbers: Optional[List[int]] = None
     base64: Optional[str] = None
     hex: Optional[str] = None
 
-    @model_validator(mode='after')
-    def one_input_required(self):
-        provided = sum(1 for v in [self.numbers, self.base64, self.hex] if v)
-        if provided != 1:
-            raise ValueError("Provide exactly one of: numbers, base64, hex")
-        return self
-
 class DecodeResponse(BaseModel):
     numbers: List[int]
     header: Dict[str, Any]
@@ -322,13 +680,45 @@ class DecodeResponse(BaseModel):
     checksum_ok: bool
     metadata: Optional[Dict[str, Any]] = None
 
+class EncodeBatchRequest(BaseModel):
+    requests: List[EncodeRequest] = Field(..., min_length=1, max_length=config.MAX_BATCH_SIZE)
+
+class EncodeBatchResponse(BaseModel):
+    count: int
+    numbers: List[List[int]]
+    base64: str = Field(..., description="Concatenated 36-byte frames")
+    headers: List[Dict[str, Any]]
+
+class DecodeBatchRequest(BaseModel):
+    numbers: Optional[List[List[int]]] = Field(default=None, max_length=config.MAX_BATCH_SIZE)
+    base64: Optional[str] = Field(default=None, description="Concatenated 36-byte frames")
+    hex: Optional[str] = Field(default=None, description="Concatenated 36-byte frames")
+
+class DecodeBatchResponse(BaseModel):
+    count: int
+    checksum_failures: int
+    messages: List[DecodeResponse]
+
+def require_one_input(req: Union[DecodeRequest, DecodeBatchRequest]) -> None:
+    """Reject decode requests that don't carry exactly one of numbers/base64/hex (422)."""
+    if (not req.numbers) + (not req.base64) + (not req.hex) != 2:
+        raise RequestValidationError([{
+            "type": "value_error",
+            "loc": ("body",),
+            "msg": "Value error, Provide exactly one of: numbers, base64, hex",
+            "input": req.model_dump(exclude_none=True),
+        }])
+
 # ============================================
 # MESSAGE QUEUE & ROUTING
 # ============================================
 
-@dataclass
+# Slotted dataclasses where supported (3.10+): no per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class Message:
-    """Internal message representation."""
+    """Internal message representation (``recipients`` stays None until used)."""
     id: str
     numbers: List[int]
     header: Dict[str, Any]
@@ -337,73 +727,213 @@ class Message:
     priority: int
     ttl: int
     sender: Optional[str] = None
-    recipients: Set[str] = field(default_factory=set)
+    recipients: Optional[Set[str]] = None
+    # Filled on first use (or by the producer) and shared by every subscriber
+    # the message fans out to
+    packed: Optional[bytes] = None
+    cached_base64: Optional[str] = None
+    cached_envelope: Optional[str] = None
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) - self.timestamp > self.ttl
+    
+    def frame(self) -> bytes:
+        """The packed 36-byte frame, computed once."""
+        if self.packed is None:
+            self.packed = pack9(self.numbers)
+        return self.packed
+    
+    def as_base64(self) -> str:
+        """Base64 of the packed frame, computed once."""
+        if self.cached_base64 is None:
+            self.cached_base64 = b64_str(self.frame())
+        return self.cached_base64
+    
+    def agent_envelope(self) -> str:
+        """JSON ``message`` envelope sent to agents, serialized once."""
+        if self.cached_envelope is None:
+            self.cached_envelope = json_dumps({
+                "type": "message",
+                "message": {
+                    "id": self.id,
+                    "base64": self.as_base64(),
+                    "header": self.header,
+                    "decoded": self.decoded,
+                }
+            })
+        return self.cached_envelope
+
+if ORJSON_AVAILABLE:
+    def vote_key_for(vote: Any) -> bytes:
+        """Canonical (sorted-key) JSON form of a vote, used to tally equal votes."""
+        try:
+            return orjson.dumps(vote, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return json.dumps(vote, sort_keys=True).encode("utf-8")
+else:
+    def vote_key_for(vote: Any) -> bytes:
+        """Canonical (sorted-key) JSON form of a vote, used to tally equal votes."""
+        return json.dumps(vote, sort_keys=True).encode("utf-8")
+
+@functools.lru_cache(maxsize=1024)
+def decode_vote_key(vote_key: bytes) -> Any:
+    """Decode a canonical vote key (memoized; callers must not mutate the result)."""
+    return json_loads(vote_key)
+
+class _QueueDict(dict):
+    """Subscriber -> bounded deque, created on first use (cap fixed at import)."""
+    __slots__ = ()
+    _MAXLEN = config.MAX_MESSAGE_QUEUE
     
-    def is_expired(self) -> bool:
-        return time.time() - self.timestamp > self.ttl
+    def __missing__(self, key: str) -> deque:
+        dq = self[key] = deque(maxlen=self._MAXLEN)
+        return dq
 
 class MessageRouter:
     """Routes messages between agents and handles pub/sub."""
     
     def __init__(self):
-        self.queues: Dict[str, deque] = defaultdict(lambda: deque(maxlen=config.MAX_MESSAGE_QUEUE))
-        self.subscriptions: Dict[str, Set[str]] = defaultdict(set)
-        self.consensus_votes: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self.queues: Dict[str, deque] = _QueueDict()
+        self.subscriptions: Dict[str, Set[str]] = {}
+        # Immutable per-channel subscriber snapshots, rebuilt after membership changes
+        self._subscriber_snapshots: Dict[str, Tuple[str, ...]] = {}
+        self.consensus_votes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Incremental tallies: action -> vote key counts, voter -> vote key, leading (key, count)
+        self.consensus_tallies: Dict[str, Counter] = defaultdict(Counter)
+        self.consensus_voter_keys: Dict[str, Dict[str, bytes]] = defaultdict(dict)
+        self.consensus_leader: Dict[str, Tuple[bytes, int]] = {}
         self.metrics: Dict[str, int] = defaultdict(int)
-        self.rate_limits: Dict[str, List[float]] = defaultdict(list)
+        self.rate_limits: Dict[str, deque] = defaultdict(deque)
+        self._rate_sweep_at = 0.0
+        # Subscriber -> futures resolved together by the next publish into its
+        # queue (one per waiting connection)
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
     
     def publish(self, channel: str, message: Message) -> int:
         """Publish message to channel."""
-        subscribers = self.subscriptions.get(channel, set())
+        subscribers = self._subscriber_snapshots.get(channel)
+        if subscribers is None:
+            subscribers = tuple(self.subscriptions.get(channel, ()))
+            self._subscriber_snapshots[channel] = subscribers
+        queues = self.queues
         for subscriber in subscribers:
-            self.queues[subscriber].append(message)
+            queues[subscriber].append(message)
+        if self._waiters:
+            for subscriber in subscribers:
+                self.notify(subscriber)
         self.metrics["messages_published"] += 1
         return len(subscribers)
     
+    def notify(self, subscriber: str) -> None:
+        """Wake every task waiting on subscriber's queue."""
+        waiters = self._waiters.pop(subscriber, None)
+        if waiters:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+    
+    def message_waiter(self, subscriber: str) -> asyncio.Future:
+        """Future resolved once subscriber has queued messages.
+        
+        Each caller gets its own future, so several loops may wait on the same
+        subscriber; keep awaiting it until it resolves rather than asking for
+        a new one per wakeup. Must be called from the event loop; publish()
+        resolves it in place.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        if self.queues.get(subscriber):
+            waiter.set_result(None)
+        else:
+            self._waiters.setdefault(subscriber, set()).add(waiter)
+        return waiter
+    
+    def drop_waiter(self, subscriber: str, waiter: Optional[asyncio.Future]) -> None:
+        """Forget one pending waiter returned by message_waiter()."""
+        if waiter is None:
+            return
+        waiter.cancel()
+        waiters = self._waiters.get(subscriber)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[subscriber]
+    
     def subscribe(self, channel: str, subscriber: str) -> None:
         """Subscribe to channel."""
-        self.subscriptions[channel].add(subscriber)
+        self.subscriptions.setdefault(channel, set()).add(subscriber)
+        self._subscriber_snapshots.pop(channel, None)
         self.metrics["subscriptions"] += 1
     
     def unsubscribe(self, channel: str, subscriber: str) -> None:
         """Unsubscribe from channel."""
-        self.subscriptions[channel].discard(subscriber)
-    
-    def get_messages(self, subscriber: str, limit: int = 10) -> List[Message]:
-        """Get messages for subscriber."""
-        queue = self.queues.get(subscriber, deque())
-        messages = []
-        while queue and len(messages) < limit:
-            msg = queue.popleft()
-            if not msg.is_expired():
-                messages.append(msg)
-        return messages
+        members = self.subscriptions.get(channel)
+        if members is not None:
+            members.discard(subscriber)
+            if not members:
+                del self.subscriptions[channel]
+            self._subscriber_snapshots.pop(channel, None)
+    
+    def drain(self, subscriber: str) -> List[Message]:
+        """Take every live queued message for subscriber at once.
+        
+        The pending deque is swapped for an empty one instead of popped
+        message by message; expired entries are filtered on the way out.
+        """
+        queue = self.queues.get(subscriber)
+        if not queue:
+            return []
+        self.queues[subscriber] = deque(maxlen=queue.maxlen)
+        now = time.time()
+        return [msg for msg in queue if not msg.is_expired(now)]
     
     def add_consensus_vote(self, action_id: str, voter_id: str, vote: Any) -> None:
         """Add vote for consensus action."""
-        if len(self.consensus_votes) >= config.MAX_CONSENSUS_ITEMS:
-            # Remove oldest consensus item
-            oldest = min(self.consensus_votes.keys())
-            del self.consensus_votes[oldest]
-        self.consensus_votes[action_id][voter_id] = vote
+        if action_id not in self.consensus_votes and len(self.consensus_votes) >= config.MAX_CONSENSUS_ITEMS:
+            # Remove oldest consensus item (insertion order)
+            oldest = next(iter(self.consensus_votes))
+            self._drop_consensus(oldest)
+        vote_key = vote_key_for(vote)
+        self.consensus_votes.setdefault(action_id, {})[voter_id] = vote
+        
+        # Update tallies in place instead of recounting on every check
+        tally = self.consensus_tallies[action_id]
+        voter_keys = self.consensus_voter_keys[action_id]
+        previous = voter_keys.get(voter_id)
+        if previous == vote_key:
+            return
+        voter_keys[voter_id] = vote_key
+        tally[vote_key] += 1
+        leader = self.consensus_leader.get(action_id)
+        if previous is not None:
+            tally[previous] -= 1
+            if not tally[previous]:
+                del tally[previous]
+            if leader is not None and leader[0] == previous:
+                # Leader lost a vote; another key may now be ahead
+                self.consensus_leader[action_id] = max(tally.items(), key=lambda kv: kv[1])
+                return
+        if leader is None or tally[vote_key] > leader[1] or vote_key == leader[0]:
+            self.consensus_leader[action_id] = (vote_key, tally[vote_key])
+    
+    def _drop_consensus(self, action_id: str) -> None:
+        """Forget all votes and tallies for an action."""
+        self.consensus_votes.pop(action_id, None)
+        self.consensus_tallies.pop(action_id, None)
+        self.consensus_voter_keys.pop(action_id, None)
+        self.consensus_leader.pop(action_id, None)
     
     def check_consensus(self, action_id: str, threshold: float) -> Optional[Any]:
         """Check if consensus reached."""
-        votes = self.consensus_votes.get(action_id, {})
-        if not votes:
+        votes = self.consensus_votes.get(action_id)
+        leader = self.consensus_leader.get(action_id)
+        if not votes or leader is None:
             return None
         
-        # Count votes
-        vote_counts = defaultdict(int)
-        for vote in votes.values():
-            vote_key = json.dumps(vote, sort_keys=True)
-            vote_counts[vote_key] += 1
-        
-        # Check if any vote exceeds threshold
-        total_votes = len(votes)
-        for vote_key, count in vote_counts.items():
-            if count / total_votes >= threshold:
-                return json.loads(vote_key)
+        # Only the leading vote can reach the threshold
+        vote_key, count = leader
+        if count / len(votes) >= threshold:
+            return decode_vote_key(vote_key)
         return None
     
     def check_rate_limit(self, client_id: str) -> bool:
@@ -411,19 +941,29 @@ class MessageRouter:
         now = time.time()
         window_start = now - config.RATE_LIMIT_WINDOW
         
-        # Clean old timestamps
-        self.rate_limits[client_id] = [
-            ts for ts in self.rate_limits[client_id] 
-            if ts > window_start
-        ]
+        # Drop idle clients once per window so the table doesn't grow unbounded
+        if now >= self._rate_sweep_at:
+            self._sweep_rate_limits(window_start)
+            self._rate_sweep_at = now + config.RATE_LIMIT_WINDOW
+        
+        # Clean old timestamps (oldest first, so only the expired head)
+        dq = self.rate_limits[client_id]
+        while dq and dq[0] <= window_start:
+            dq.popleft()
         
         # Check limit
-        if len(self.rate_limits[client_id]) >= config.RATE_LIMIT_MESSAGES:
+        if len(dq) >= config.RATE_LIMIT_MESSAGES:
             return False
         
-        self.rate_limits[client_id].append(now)
+        dq.append(now)
         return True
     
+    def _sweep_rate_limits(self, window_start: float) -> None:
+        """Forget clients with no requests inside the current window."""
+        idle = [cid for cid, dq in self.rate_limits.items() if not dq or dq[-1] <= window_start]
+        for cid in idle:
+            del self.rate_limits[cid]
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get router metrics."""
         return {
@@ -438,76 +978,419 @@ class MessageRouter:
 # WEBSOCKET CONNECTION MANAGER
 # ============================================
 
+# Opt-in WebSocket subprotocols; clients that don't offer one get JSON text frames
+WS_MSGPACK_SUBPROTOCOL = "nlc9.msgpack"  # /ws: msgpack commands and replies
+WS_BINARY_SUBPROTOCOL = "nlc9.binary"    # /ws/agent: raw NLC-9 frames for deliveries
+
+_U16 = struct.Struct(">H")
+
+# Leading type byte of nlc9.binary frames
+BIN_MESSAGE = b"\x01"    # followed by one 36-byte NLC-9 frame
+BIN_HEARTBEAT = b"\x02"  # no payload
+BIN_BATCH = b"\x03"      # uint16 count, then per frame uint16 length + frame (pack_frames_batch)
+BIN_BROADCAST = b"\x04"  # live channel push: followed by one 36-byte NLC-9 frame
+
+# Server heartbeats carry no timestamp, so every connection shares one payload
+JSON_HEARTBEAT = json_dumps({"type": "heartbeat"})
+
+_FRAME_LEN = _U16.pack(36)
+
+def pack_frames_batch(frames: List[bytes]) -> bytes:
+    """BIN_BATCH message for already-packed 36-byte frames.
+    
+    Layout: BIN_BATCH, uint16 count, then per frame uint16 length + frame.
+    The fixed length prefix doubles as the join separator, so it is one
+    join, no per-frame work.
+    """
+    if not frames:
+        return BIN_BATCH + _U16.pack(0)
+    return BIN_BATCH + _U16.pack(len(frames)) + _FRAME_LEN + _FRAME_LEN.join(frames)
+
+# Close codes for connections the server drops on its own
+WS_CLOSE_SLOW = 1013      # outbox overflowed: try again later
+WS_CLOSE_ERROR = 1011     # a send to the socket failed
+WS_CLOSE_REPLACED = 4000  # another connection took over the same client id
+
+class Outbox:
+    """Bounded single-consumer send buffer: a deque plus one Future to wake the consumer.
+
+    Cheaper than asyncio.Queue for one writer task per socket: push is a
+    deque append and, only when the consumer is parked, one set_result.
+    """
+    __slots__ = ("pending", "limit", "_waker")
+    
+    def __init__(self, limit: int):
+        self.pending: deque = deque()
+        self.limit = limit
+        self._waker: Optional[asyncio.Future] = None
+    
+    def push(self, payload: Union[str, bytes]) -> bool:
+        """Append a payload; False if the outbox is full."""
+        if len(self.pending) >= self.limit:
+            return False
+        self.pending.append(payload)
+        waker = self._waker
+        if waker is not None and not waker.done():
+            waker.set_result(None)
+        return True
+    
+    async def put(self, payload: Union[str, bytes]) -> None:
+        """Owner-side write: append past the limit and wait until it is sent.
+        
+        A Future queued right behind the payload marks the point the sender
+        has to reach, so the connection's own replies keep their order with
+        pushes and still get backpressure from the socket.
+        """
+        sent = asyncio.get_running_loop().create_future()
+        self.pending.append(payload)
+        self.pending.append(sent)
+        waker = self._waker
+        if waker is not None and not waker.done():
+            waker.set_result(None)
+        await sent
+    
+    async def wait(self) -> None:
+        """Park until something is pushed (returns at once if already pending)."""
+        if self.pending:
+            return
+        self._waker = asyncio.get_running_loop().create_future()
+        try:
+            await self._waker
+        finally:
+            self._waker = None
+
 class ConnectionManager:
-    """Manages WebSocket connections and broadcasts."""
+    """Manages WebSocket connections and broadcasts.
+
+    Every write to a connected socket goes through its per-client Outbox,
+    drained by that client's sender task, so sends never interleave. Pushes
+    (broadcasts, personal messages, heartbeats) are bounded and never wait on
+    a socket: a slow client is dropped instead of stalling everyone else.
+    The endpoint's own replies and deliveries use send(), which waits for its
+    payload to go out. All bookkeeping runs on the event loop without
+    awaiting in between, so it needs no lock.
+    """
     
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
         self.channels: Dict[str, Set[str]] = defaultdict(set)
+        self._channel_snapshots: Dict[str, Tuple[str, ...]] = {}
+        self.outboxes: Dict[str, Outbox] = {}
+        self.senders: Dict[str, asyncio.Task] = {}
+        self.heartbeats: Dict[str, asyncio.TimerHandle] = {}
+        # Close handshakes in flight for dropped sockets (kept referenced)
+        self._closing: Set[asyncio.Task] = set()
+        # Clients on a binary subprotocol get pre-encoded binary pushes:
+        # msgpack-encoded payloads, or raw NLC-9 frames (nlc9.binary)
+        self.msgpack_clients: Set[str] = set()
+        self.raw_clients: Set[str] = set()
     
-    async def connect(self, client_id: str, websocket: WebSocket, metadata: Dict = None):
+    async def connect(self, client_id: str, websocket: WebSocket, metadata: Dict = None,
+                      subprotocol: Optional[str] = None):
         """Accept new connection."""
-        await websocket.accept()
+        await websocket.accept(subprotocol=subprotocol)
+        old_sender = self.senders.pop(client_id, None)
+        if old_sender is not None:
+            old_sender.cancel()
+        old_heartbeat = self.heartbeats.pop(client_id, None)
+        if old_heartbeat is not None:
+            old_heartbeat.cancel()
+        old_websocket = self.active_connections.get(client_id)
+        if old_websocket is not None and old_websocket is not websocket:
+            # Unwind the superseded endpoint instead of leaving it parked
+            self._close_later(old_websocket, WS_CLOSE_REPLACED)
         self.active_connections[client_id] = websocket
         self.connection_metadata[client_id] = metadata or {}
         self.connection_metadata[client_id]["connected_at"] = time.time()
+        self.msgpack_clients.discard(client_id)
+        self.raw_clients.discard(client_id)
+        if subprotocol == WS_MSGPACK_SUBPROTOCOL:
+            self.msgpack_clients.add(client_id)
+        elif subprotocol == WS_BINARY_SUBPROTOCOL:
+            self.raw_clients.add(client_id)
+        outbox = Outbox(config.WEBSOCKET_SEND_QUEUE)
+        self.outboxes[client_id] = outbox
+        self.senders[client_id] = asyncio.create_task(self._sender(client_id, websocket, outbox))
+    
+    async def _sender(self, client_id: str, websocket: WebSocket, outbox: Outbox):
+        """Drain one client's outbox; the only task writing to that socket."""
+        pending = outbox.pending
+        try:
+            while True:
+                await outbox.wait()
+                while pending:
+                    payload = pending.popleft()
+                    if isinstance(payload, str):
+                        await websocket.send_text(payload)
+                    elif isinstance(payload, bytes):
+                        await websocket.send_bytes(payload)
+                    elif not payload.done():
+                        # Outbox.put() marker: everything before it is sent
+                        payload.set_result(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed: drop the client unless it already reconnected
+            if self.active_connections.get(client_id) is websocket:
+                self.senders.pop(client_id, None)
+                self.disconnect(client_id, WS_CLOSE_ERROR)
+        finally:
+            # Nothing further will be sent; release writers waiting in put()
+            while pending:
+                payload = pending.popleft()
+                if isinstance(payload, asyncio.Future) and not payload.done():
+                    payload.set_exception(WebSocketDisconnect(1006))
+    
+    async def send(self, client_id: str, payload: Union[str, bytes]) -> None:
+        """Write to a client through its outbox and wait until it is sent.
+        
+        Raises WebSocketDisconnect once the client has been dropped.
+        """
+        outbox = self.outboxes.get(client_id)
+        if outbox is None:
+            raise WebSocketDisconnect(1006)
+        await outbox.put(payload)
     
-    def disconnect(self, client_id: str):
-        """Remove connection."""
+    def disconnect(self, client_id: str, close_code: Optional[int] = None):
+        """Remove connection.
+        
+        With ``close_code`` (the server dropping a client) the socket is also
+        closed, so its endpoint's receive() returns and the endpoint runs its
+        own teardown (channel detach, router queue).
+        """
         if client_id in self.active_connections:
-            del self.active_connections[client_id]
+            websocket = self.active_connections.pop(client_id)
+            if close_code is not None:
+                self._close_later(websocket, close_code)
             del self.connection_metadata[client_id]
+            self.outboxes.pop(client_id, None)
+            self.msgpack_clients.discard(client_id)
+            self.raw_clients.discard(client_id)
+            sender = self.senders.pop(client_id, None)
+            if sender is not None:
+                sender.cancel()
+            heartbeat = self.heartbeats.pop(client_id, None)
+            if heartbeat is not None:
+                heartbeat.cancel()
             # Remove from all channels
-            for channel in self.channels.values():
-                channel.discard(client_id)
+            for name, members in self.channels.items():
+                if client_id in members:
+                    members.discard(client_id)
+                    self._channel_snapshots.pop(name, None)
+    
+    def _close_later(self, websocket: WebSocket, code: int) -> None:
+        """Start a close handshake on a socket without waiting for it."""
+        if (websocket.client_state != WebSocketState.CONNECTED
+                or websocket.application_state != WebSocketState.CONNECTED):
+            return
+        
+        async def close():
+            try:
+                await websocket.close(code=code)
+            except Exception:
+                pass  # already gone
+        
+        task = asyncio.get_running_loop().create_task(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    def start_heartbeat(self, client_id: str, payload: Union[str, bytes],
+                        interval: Optional[float] = None):
+        """Push ``payload`` to a connected client every ``interval`` seconds.
+        
+        A loop timer rather than a task: an idle connection costs one wakeup
+        per interval, and disconnect() cancels it.
+        """
+        interval = config.WEBSOCKET_HEARTBEAT if interval is None else interval
+        loop = asyncio.get_running_loop()
+        outbox = self.outboxes[client_id]
+        
+        def fire():
+            if self.outboxes.get(client_id) is not outbox:
+                return
+            if not outbox.push(payload):
+                self.disconnect(client_id, WS_CLOSE_SLOW)
+                return
+            self.heartbeats[client_id] = loop.call_later(interval, fire)
+        
+        previous = self.heartbeats.get(client_id)
+        if previous is not None:
+            previous.cancel()
+        self.heartbeats[client_id] = loop.call_later(interval, fire)
+    
+    def _targets(self, channel: Optional[str]):
+        """Clients to push to: the channel's member snapshot, else everyone."""
+        if not channel:
+            return self.active_connections.keys()
+        snapshot = self._channel_snapshots.get(channel)
+        if snapshot is None:
+            members = self.channels.get(channel)
+            if members is None:
+                return self.active_connections.keys()
+            snapshot = self._channel_snapshots[channel] = tuple(members)
+        return snapshot
+    
+    def _enqueue(self, client_id: str, message: Union[str, bytes]) -> bool:
+        """Queue a push for a client; False if its outbox is full."""
+        return self.outboxes[client_id].push(message)
     
     async def send_personal_message(self, message: str, client_id: str):
         """Send message to specific client."""
         if client_id in self.active_connections:
             websocket = self.active_connections[client_id]
             if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_text(message)
+                if not self._enqueue(client_id, message):
+                    self.disconnect(client_id, WS_CLOSE_SLOW)
     
-    async def broadcast(self, message: str, channel: str = None):
-        """Broadcast message to all or channel."""
-        disconnected = []
-        targets = self.channels.get(channel, self.active_connections.keys()) if channel else self.active_connections.keys()
+    async def broadcast(self, message: str, channel: str = None, binary: Optional[bytes] = None,
+                        frame: Optional[bytes] = None):
+        """Broadcast message to all or channel.
+
+        ``binary``, if given, is the same payload msgpack-encoded for
+        nlc9.msgpack clients. ``frame``, if given, is the packed NLC-9 frame,
+        sent as ``BIN_BROADCAST + frame`` to nlc9.binary clients, so agents can
+        tell a live push from the queued BIN_MESSAGE copy. Each encoding
+        is built once and the same object is shared by every client using it.
+        """
+        targets = self._targets(channel)
+        msgpack_clients = self.msgpack_clients if binary is not None else ()
+        raw_clients = self.raw_clients if frame is not None else ()
+        raw = BIN_BROADCAST + frame if raw_clients else None
         
-        for client_id in targets:
-            if client_id in self.active_connections:
-                try:
-                    await self.active_connections[client_id].send_text(message)
-                except:
-                    disconnected.append(client_id)
+        # Enqueue for each target; clients with a full outbox are too slow
+        slow = []
+        for cid in targets:
+            outbox = self.outboxes.get(cid)
+            if outbox is None:
+                continue
+            if cid in raw_clients:
+                payload = raw
+            elif cid in msgpack_clients:
+                payload = binary
+            else:
+                payload = message
+            if not outbox.push(payload):
+                slow.append(cid)
         
-        # Clean up disconnected clients
-        for client_id in disconnected:
-            self.disconnect(client_id)
+        # Clean up slow clients
+        for client_id in slow:
+            self.disconnect(client_id, WS_CLOSE_SLOW)
     
     def join_channel(self, client_id: str, channel: str):
         """Join a broadcast channel."""
         self.channels[channel].add(client_id)
+        self._channel_snapshots.pop(channel, None)
     
     def leave_channel(self, client_id: str, channel: str):
         """Leave a broadcast channel."""
-        self.channels[channel].discard(client_id)
+        members = self.channels.get(channel)
+        if members is not None:
+            members.discard(client_id)
+            self._channel_snapshots.pop(channel, None)
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get connection statistics."""
-        return {
+    def get_stats(self, include_uptime: bool = True) -> Dict[str, Any]:
+        """Get connection statistics (per-client uptimes are O(connections))."""
+        stats = {
             "active_connections": len(self.active_connections),
             "channels": {ch: len(clients) for ch, clients in self.channels.items()},
-            "uptime_seconds": {
-                cid: time.time() - meta["connected_at"]
+        }
+        if include_uptime:
+            now = time.time()
+            stats["uptime_seconds"] = {
+                cid: now - meta["connected_at"]
                 for cid, meta in self.connection_metadata.items()
             }
-        }
+        return stats
 
 # ============================================
 # ENHANCED CODEC
 # ============================================
 
+def _encode_generic_value(v: JsonVal) -> int:
+    """Encode a schema-less parameter value (subclass-safe slow path)."""
+    if isinstance(v, bool):
+        enc = 1 if v else 0
+    elif isinstance(v, (int, float)):
+        enc = to_fixed_u32(float(v), 1_000_000) if isinstance(v, float) else v
+    else:
+        enc = token_id(str(v))
+    return u32(enc)
+
+# Exact-type dispatch for schema-less parameter values
+_GENERIC_ENCODERS = {
+    bool: lambda v: 1 if v else 0,
+    int: u32,
+    float: lambda v: to_fixed_u32(v, 1_000_000),
+    str: token_id,
+}
+
+# Static part of a message: limbs hdr..c, their packed bytes, the CRC state
+# after them, and the header info minus priority/ttl
+StaticLimbs = Tuple[Tuple[int, int, int, int, int, int], bytes, int, Dict[str, Any]]
+
+_S6 = struct.Struct(">6I")
+_S3 = struct.Struct(">3I")
+
+def _compute_static_limbs(
+    verb: str,
+    object: str,
+    params: Optional[Dict[str, JsonVal]],
+    flags: Optional[List[str]],
+    domain: Optional[str],
+) -> StaticLimbs:
+    """Encode everything in a message that doesn't depend on timestamp/correlation."""
+    verb_id, obj_id, dom16 = resolve_ids(verb, object, domain)
+    a, b, c = NLC9Codec.encode_params(verb_id, obj_id, params)
+    hdr = pack_header(config.VERSION, flags_to_bits(flags), dom16)
+    limbs = (hdr, verb_id, obj_id, a, b, c)
+    prefix = _S6.pack(*limbs)
+    header_info = {
+        "version": config.VERSION,
+        "flags": bits_to_flags((hdr >> 16) & 0xFFF),
+        "domain_id": hdr & 0xFFFF,
+        "domain": domain,
+        "verb_id": verb_id,
+        "verb": name_for_verb_id(verb_id),
+        "object_id": obj_id,
+        "object": name_for_object_id(obj_id),
+    }
+    return limbs, prefix, _crc32(prefix), header_info
+
+@functools.lru_cache(maxsize=4096)
+def _static_limbs_cached(
+    verb: str,
+    object: str,
+    params_key: Optional[Tuple[Tuple[str, type, JsonVal], ...]],
+    flags_key: Optional[Tuple[str, ...]],
+    domain: Optional[str],
+) -> StaticLimbs:
+    params = {k: v for k, _, v in params_key} if params_key else None
+    return _compute_static_limbs(verb, object, params, list(flags_key) if flags_key else None, domain)
+
+def static_limbs(
+    verb: str,
+    object: str,
+    params: Optional[Dict[str, JsonVal]],
+    flags: Optional[List[str]],
+    domain: Optional[str],
+) -> StaticLimbs:
+    """Memoized static limbs for repeated logical messages.
+
+    Values are keyed with their type so 1, 1.0 and True don't share an entry.
+    Unhashable inputs skip the cache.
+    """
+    try:
+        return _static_limbs_cached(
+            verb,
+            object,
+            tuple([(k, v.__class__, v) for k, v in params.items()]) if params else None,
+            tuple(flags) if flags else None,
+            domain,
+        )
+    except TypeError:
+        return _compute_static_limbs(verb, object, params, flags, domain)
+
 class NLC9Codec:
     """Enhanced encoder/decoder with schema support."""
     
@@ -518,59 +1401,20 @@ class NLC9Codec:
         if not params:
             return a, b, c
         
-        # Try to get schema
-        schema_key = (verb_id, obj_id)
-        if schema_key in SCHEMAS:
-            schema = SCHEMAS[schema_key]
-            slots = [0, 0, 0]
-            
-            for i, spec in enumerate(schema.params[:3]):
-                val = params.get(spec.name)
-                if val is None:
-                    if spec.required:
-                        raise ValueError(f"Required parameter '{spec.name}' missing")
-                    slots[i] = 0
-                    continue
-                
-                # Encode based on type
-                if spec.type == "int":
-                    slots[i] = u32(int(val))
-                elif spec.type == "float":
-                    slots[i] = to_fixed_u32(float(val), spec.scale or 1_000_000)
-                elif spec.type == "bool":
-                    slots[i] = 1 if val else 0
-                elif spec.type == "percent":
-                    # Store as basis points (0.01% precision)
-                    slots[i] = u32(int(float(val) * 10000))
-                elif spec.type == "amount":
-                    # Store with 6 decimal precision
-                    slots[i] = to_fixed_u32(float(val), 1_000_000)
-                elif spec.type == "timestamp":
-                    slots[i] = u32(int(val))
-                elif spec.type in ("string", "id", "hash", "address"):
-                    slots[i] = token_id(str(val))
-                else:
-                    slots[i] = u32(int(val))
-                
-                # Apply constraints
-                if spec.min_value is not None and slots[i] < spec.min_value:
-                    raise ValueError(f"Parameter '{spec.name}' below minimum value")
-                if spec.max_value is not None and slots[i] > spec.max_value:
-                    raise ValueError(f"Parameter '{spec.name}' above maximum value")
-            
-            a, b, c = slots
+        # Use the schema's generated encoder if registered
+        encode = _SCHEMA_ENC_FN.get((verb_id, obj_id))
+        if encode is not None:
+            a, b, c = encode(params)
         else:
-            # Generic encoding for unknown schemas
-            items = sorted(params.items())[:3]
+            # Generic encoding for unknown schemas: first three keys in sorted order
+            if len(params) <= 3:
+                items = sorted(params.items())
+            else:
+                items = [(k, params[k]) for k in nsmallest(3, params)]
             slots = []
             for k, v in items:
-                if isinstance(v, bool):
-                    enc = 1 if v else 0
-                elif isinstance(v, (int, float)):
-                    enc = to_fixed_u32(float(v), 1_000_000) if isinstance(v, float) else v
-                else:
-                    enc = token_id(str(v))
-                slots.append(u32(enc))
+                encode_value = _GENERIC_ENCODERS.get(type(v))
+                slots.append(encode_value(v) if encode_value else _encode_generic_value(v))
             while len(slots) < 3:
                 slots.append(0)
             a, b, c = slots
@@ -580,37 +1424,10 @@ class NLC9Codec:
     @staticmethod
     def decode_params(verb_id: int, obj_id: int, a: int, b: int, c: int) -> Dict[str, JsonVal]:
         """Decode parameters from three uint32s."""
-        schema_key = (verb_id, obj_id)
+        decode = _SCHEMA_DEC_FN.get((verb_id, obj_id))
         
-        if schema_key in SCHEMAS:
-            schema = SCHEMAS[schema_key]
-            result = {}
-            slots = [a, b, c]
-            
-            for i, spec in enumerate(schema.params[:3]):
-                if i >= 3:
-                    break
-                val = slots[i]
-                
-                if spec.type == "int":
-                    result[spec.name] = val
-                elif spec.type == "float":
-                    result[spec.name] = from_fixed_u32(val, spec.scale or 1_000_000)
-                elif spec.type == "bool":
-                    result[spec.name] = bool(val & 1)
-                elif spec.type == "percent":
-                    result[spec.name] = val / 10000.0
-                elif spec.type == "amount":
-                    result[spec.name] = val / 1_000_000.0
-                elif spec.type == "timestamp":
-                    result[spec.name] = val
-                elif spec.type in ("string", "id", "hash", "address"):
-                    # Can't reverse hash, return as ID reference
-                    result[spec.name] = f"ID#{val}"
-                else:
-                    result[spec.name] = val
-            
-            return result
+        if decode is not None:
+            return decode(a, b, c)
         else:
             # Generic decoding
             return {
@@ -620,53 +1437,104 @@ class NLC9Codec:
             }
     
     @staticmethod
-    def build_message(req: EncodeRequest) -> Tuple[List[int], Dict[str, Any]]:
-        """Build NLC9 message from request."""
-        # Get IDs
-        verb_id = VERBS.get(req.verb.upper(), token_id(req.verb))
-        obj_id = OBJECTS.get(req.object.upper(), token_id(req.object))
-        
-        # Encode parameters
-        a, b, c = NLC9Codec.encode_params(verb_id, obj_id, req.params)
+    def build_message(req: EncodeRequest) -> Tuple[List[int], Dict[str, Any], bytes]:
+        """Build NLC9 message from request; also returns the packed 36-byte frame."""
+        frame, nums, header = NLC9Codec.build_frame(
+            req.verb, req.object, req.params, req.flags, req.domain,
+            req.timestamp, req.correlation_id, req.priority, req.ttl,
+        )
+        return nums, header, frame
+    
+    @staticmethod
+    def build_frame(
+        verb: str,
+        object: str,
+        params: Optional[Dict[str, JsonVal]] = None,
+        flags: Optional[List[str]] = None,
+        domain: Optional[str] = None,
+        timestamp: Optional[int] = None,
+        correlation_id: Optional[int] = None,
+        priority: Optional[int] = 5,
+        ttl: Optional[int] = 3600,
+    ) -> Tuple[bytes, List[int], Dict[str, Any]]:
+        """Build NLC9 message and its packed 36-byte frame in one pass."""
+        static, prefix, crc_state, header_static = static_limbs(verb, object, params, flags, domain)
+        # Masked inline; randbits(32) is already in range
+        ts = int(timestamp if timestamp is not None else time.time()) & 0xFFFFFFFF
+        corr = correlation_id & 0xFFFFFFFF if correlation_id is not None else secrets.randbits(32)
         
-        # Build message
-        ts = int(req.timestamp if req.timestamp is not None else time.time())
-        corr = u32(req.correlation_id if req.correlation_id is not None else secrets.randbits(32))
-        hdr = pack_header(config.VERSION, flags_to_bits(req.flags), domain_id16(req.domain))
+        # Continue the cached CRC over the two variable limbs and the zeroed checksum
+        crc = _crc32(_S3.pack(ts, corr, 0), crc_state)
+        frame = prefix + _S3.pack(ts, corr, crc)
+        header_info = {**header_static, "priority": priority or 5, "ttl": ttl or 3600}
+        return frame, [*static, ts, corr, crc], header_info
+    
+    @staticmethod
+    def build_limbs(
+        verb: str,
+        object: str,
+        params: Optional[Dict[str, JsonVal]] = None,
+        flags: Optional[List[str]] = None,
+        domain: Optional[str] = None,
+        timestamp: Optional[int] = None,
+        correlation_id: Optional[int] = None,
+        priority: Optional[int] = 5,
+        ttl: Optional[int] = 3600,
+    ) -> Tuple[Tuple[int, ...], Dict[str, Any]]:
+        """Build the first eight limbs (everything except the CRC)."""
+        static, _, _, header_static = static_limbs(verb, object, params, flags, domain)
         
-        # Calculate checksum
-        first8 = [hdr, verb_id, obj_id, a, b, c, u32(ts), corr]
-        crc = crc32_u32(pack9(first8 + [0]))
-        nums = first8 + [crc]
+        # Only timestamp and correlation vary between identical logical messages
+        # Masked inline; randbits(32) is already in range
+        ts = int(timestamp if timestamp is not None else time.time()) & 0xFFFFFFFF
+        corr = correlation_id & 0xFFFFFFFF if correlation_id is not None else secrets.randbits(32)
         
-        # Build header info
-        header_info = {
-            "version": config.VERSION,
-            "flags": bits_to_flags((hdr >> 16) & 0xFFF),
-            "domain_id": hdr & 0xFFFF,
-            "domain": req.domain,
-            "verb_id": verb_id,
-            "verb": REV_VERBS.get(verb_id, f"VERB#{verb_id}"),
-            "object_id": obj_id,
-            "object": REV_OBJECTS.get(obj_id, f"OBJECT#{obj_id}"),
-            "priority": req.priority or 5,
-            "ttl": req.ttl or 3600,
-        }
+        header_info = {**header_static, "priority": priority or 5, "ttl": ttl or 3600}
+        return (*static, ts, corr), header_info
+    
+    @staticmethod
+    def build_batch(reqs: List[EncodeRequest]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Build N messages as an (N, 9) big-endian uint32 array with CRCs filled in."""
+        rows = []
+        headers = []
+        for req in reqs:
+            limbs, header = NLC9Codec.build_limbs(
+                req.verb, req.object, req.params, req.flags, req.domain,
+                req.timestamp, req.correlation_id, req.priority, req.ttl,
+            )
+            rows.append(limbs)
+            headers.append(header)
         
-        return [u32(n) for n in nums], header_info
+        frames = np.zeros((len(rows), 9), dtype=">u4")
+        frames[:, :8] = rows
+        frames[:, 8] = crc32_frames(frames)
+        return frames, headers
     
     @staticmethod
-    def parse_message(nums: List[int]) -> DecodeResponse:
-        """Parse NLC9 message from numbers."""
+    def parse_message(nums: List[int], checksum_ok: Optional[bool] = None,
+                      frame: Optional[bytes] = None) -> DecodeResponse:
+        """Parse NLC9 message from numbers (pass checksum_ok if already verified)."""
+        return DecodeResponse(**NLC9Codec.parse_message_dict(nums, checksum_ok, frame))
+    
+    @staticmethod
+    def parse_message_dict(nums: List[int], checksum_ok: Optional[bool] = None,
+                           frame: Optional[bytes] = None) -> Dict[str, Any]:
+        """Parse NLC9 message into a plain dict shaped like DecodeResponse (no model overhead).
+
+        Limbs must already be uint32 (unpack9 output, or masked caller input).
+        Pass the packed ``frame`` when the caller already has it to skip repacking.
+        """
         if len(nums) != 9:
             raise ValueError("Need exactly 9 numbers")
         
-        hdr, v_id, o_id, a, b, c, ts, corr, crc = [u32(n) for n in nums]
+        hdr, v_id, o_id, a, b, c, ts, corr, crc = nums
         version, flags_bits, dom16 = unpack_header(hdr)
+        if frame is None:
+            frame = pack9(nums)
         
         # Verify checksum
-        recompute = crc32_u32(pack9([hdr, v_id, o_id, a, b, c, ts, corr, 0]))
-        checksum_ok = (recompute == crc)
+        if checksum_ok is None:
+            checksum_ok = (_crc32(frame[:32] + _CRC_ZERO) == crc)
         
         # Decode parameters
         decoded_params = NLC9Codec.decode_params(v_id, o_id, a, b, c)
@@ -674,9 +1542,9 @@ class NLC9Codec:
         # Build response
         decoded = {
             "verb_id": v_id,
-            "verb": REV_VERBS.get(v_id, f"VERB#{v_id}"),
+            "verb": name_for_verb_id(v_id),
             "object_id": o_id,
-            "object": REV_OBJECTS.get(o_id, f"OBJECT#{o_id}"),
+            "object": name_for_object_id(o_id),
             "params": decoded_params,
             "timestamp": ts,
             "correlation_id": corr,
@@ -688,28 +1556,32 @@ class NLC9Codec:
             "domain_id": dom16,
         }
         
-        # Get schema info if available
-        metadata = None
-        schema_key = (v_id, o_id)
-        if schema_key in SCHEMAS:
-            schema = SCHEMAS[schema_key]
-            metadata = {
-                "schema": {
-                    "description": schema.description,
-                    "tags": schema.tags,
-                }
-            }
+        # Get schema info if available (prebuilt at registration)
+        metadata = _SCHEMA_META.get((v_id, o_id))
         
-        b = pack9(nums)
-        return DecodeResponse(
-            numbers=[int(x) for x in nums],
-            header=header,
-            decoded=decoded,
-            base64=base64.b64encode(b).decode("ascii"),
-            hex=b.hex(),
-            checksum_ok=checksum_ok,
-            metadata=metadata,
-        )
+        return {
+            "numbers": list(nums),
+            "header": header,
+            "decoded": decoded,
+            "base64": b64_str(frame),
+            "hex": frame.hex(),
+            "checksum_ok": checksum_ok,
+            "metadata": metadata,
+        }
+    
+    @staticmethod
+    def parse_batch(frames: np.ndarray) -> List[DecodeResponse]:
+        """Parse an (N, 9) uint32 array, verifying all CRCs in one pass."""
+        work = np.array(frames, dtype=">u4")
+        raw = work.tobytes()
+        expected = work[:, 8].copy()
+        work[:, 8] = 0
+        checksums_ok = (crc32_frames(work) == expected).tolist()
+        # Slice each row's frame out of the one wire buffer instead of repacking it
+        return [
+            NLC9Codec.parse_message(row, ok, raw[i:i + 36])
+            for i, row, ok in zip(range(0, len(raw), 36), frames.tolist(), checksums_ok)
+        ]
 
 # ============================================
 # TRADING SCHEMAS
@@ -719,7 +1591,7 @@ def register_trading_schemas():
     """Register all trading-related schemas."""
     
     # Market signal schema
-    SCHEMAS[(VERBS["SIGNAL"], OBJECTS["MARKET"])] = SchemaRegistration(
+    install_schema((VERBS["SIGNAL"], OBJECTS["MARKET"]), SchemaRegistration(
         verb="SIGNAL",
         object="MARKET",
         params=[
@@ -729,11 +1601,11 @@ def register_trading_schemas():
         ],
         description="Broadcast market signal",
         tags=["trading", "signal"],
-    )
+    ))
     
     # Trade execution schema (fix TRADE object reference)
     trade_obj_id = OBJECTS.get("ORDER", token_id("trade"))  # Use ORDER instead of TRADE
-    SCHEMAS[(VERBS["EXEC"], trade_obj_id)] = SchemaRegistration(
+    install_schema((VERBS["EXEC"], trade_obj_id), SchemaRegistration(
         verb="EXEC",
         object="ORDER",  # Changed from TRADE to ORDER
         params=[
@@ -743,11 +1615,11 @@ def register_trading_schemas():
         ],
         description="Execute trade order",
         tags=["trading", "execution"],
-    )
+    ))
     
     # Swarm coordination schema (fix COORD verb reference)
     coord_verb_id = VERBS.get("COORD", token_id("coord"))
-    SCHEMAS[(coord_verb_id, OBJECTS["SWARM"])] = SchemaRegistration(
+    install_schema((coord_verb_id, OBJECTS["SWARM"]), SchemaRegistration(
         verb="COORD",
         object="SWARM",
         params=[
@@ -757,10 +1629,10 @@ def register_trading_schemas():
         ],
         description="Coordinate swarm action",
         tags=["coordination", "swarm"],
-    )
+    ))
     
     # Wallet operation schema
-    SCHEMAS[(VERBS["EXEC"], OBJECTS["WALLET"])] = SchemaRegistration(
+    install_schema((VERBS["EXEC"], OBJECTS["WALLET"]), SchemaRegistration(
         verb="EXEC",
         object="WALLET",
         params=[
@@ -770,10 +1642,10 @@ def register_trading_schemas():
         ],
         description="Execute wallet operation",
         tags=["wallet", "transfer"],
-    )
+    ))
     
     # Strategy update schema
-    SCHEMAS[(VERBS["SET"], OBJECTS["STRATEGY"])] = SchemaRegistration(
+    install_schema((VERBS["SET"], OBJECTS["STRATEGY"]), SchemaRegistration(
         verb="SET",
         object="STRATEGY",
         params=[
@@ -783,7 +1655,7 @@ def register_trading_schemas():
         ],
         description="Update strategy parameters",
         tags=["strategy", "risk"],
-    )
+    ))
 
 # ============================================
 # FASTAPI APPLICATION
@@ -809,10 +1681,39 @@ router = MessageRouter()
 manager = ConnectionManager()
 codec = NLC9Codec()
 
+# client -> channels registered through attach(), undone by detach_all()
+_ATTACHED: Dict[str, Set[str]] = {}
+
+def attach(client_id: str, channel: str, push: bool = True) -> None:
+    """Register a client on a channel in one call.
+    
+    Subscribes its router queue and, with ``push``, joins the live
+    broadcast fan-out for the channel as well.
+    """
+    router.subscribe(channel, client_id)
+    if push:
+        manager.join_channel(client_id, channel)
+    _ATTACHED.setdefault(client_id, set()).add(channel)
+
+def detach_all(client_id: str, drop_queue: bool = False) -> None:
+    """Detach a client from every channel it attached to (connection teardown).
+    
+    ``drop_queue`` also discards its router queue, for clients whose id is
+    never reused.
+    """
+    for channel in _ATTACHED.pop(client_id, ()):
+        router.unsubscribe(channel, client_id)
+        manager.leave_channel(client_id, channel)
+    if drop_queue:
+        router.queues.pop(client_id, None)
+
 # Register trading schemas on startup
 @app.on_event("startup")
 async def startup_event():
     register_trading_schemas()
+    if NUMBA_AVAILABLE:
+        # Compile the batch CRC kernel now rather than on the first batch request
+        crc32_frames(np.zeros((1, 9), dtype=">u4"))
     if config.ENABLE_PERSISTENCE and REDIS_AVAILABLE:
         # Initialize Redis connection if persistence enabled
         try:
@@ -846,9 +1747,8 @@ def root():
 def ping():
     return "pong"
 
-@app.get("/spec")
-def get_spec():
-    """Get protocol specification."""
+def build_spec() -> Dict[str, Any]:
+    """Build the protocol specification document."""
     return {
         "version": config.VERSION,
         "flags": list(FLAG_BITS.keys()),
@@ -877,6 +1777,20 @@ def get_spec():
         ],
     }
 
+_SPEC_BYTES: bytes = b""
+
+def refresh_spec() -> None:
+    """Re-serialize the cached /spec body (call after VERBS/OBJECTS change)."""
+    global _SPEC_BYTES
+    _SPEC_BYTES = json_bytes(build_spec())
+
+refresh_spec()
+
+@app.get("/spec")
+async def get_spec():
+    """Get protocol specification (pre-serialized)."""
+    return Response(content=_SPEC_BYTES, media_type="application/json")
+
 @app.get("/verbs")
 def get_verbs(category: Optional[str] = None):
     """Get registered verbs."""
@@ -900,11 +1814,10 @@ def get_objects(category: Optional[str] = None):
     return {"objects": OBJECTS}
 
 @app.post("/encode", response_model=EncodeResponse)
-async def encode_message(req: EncodeRequest):
-    """Encode message to NLC-9 format."""
+async def encode_message(req: EncodeRequest, format: EncodeFormat = "all"):
+    """Encode message to NLC-9 format (``format`` limits which encodings are returned)."""
     try:
-        nums, header = codec.build_message(req)
-        b = pack9(nums)
+        nums, header, b = codec.build_message(req)
         
         # Store message if persistence enabled
         if config.ENABLE_PERSISTENCE and hasattr(app.state, "redis") and app.state.redis:
@@ -914,43 +1827,92 @@ async def encode_message(req: EncodeRequest):
             except Exception as e:
                 print(f"Redis storage error: {e}")
         
-        return EncodeResponse(
-            numbers=nums,
-            base64=base64.b64encode(b).decode("ascii"),
-            hex=b.hex(),
-            header=header,
-            metadata={"priority": req.priority, "ttl": req.ttl},
-        )
+        # Serialize directly; response_model stays for the OpenAPI schema only
+        return Response(content=json_bytes({
+            "numbers": nums,
+            "base64": b64_str(b) if format in ("all", "b64") else None,
+            "hex": b.hex() if format in ("all", "hex") else None,
+            "header": header,
+            "metadata": {"priority": req.priority, "ttl": req.ttl},
+        }), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/decode", response_model=DecodeResponse)
 def decode_message(req: DecodeRequest):
     """Decode NLC-9 message."""
+    require_one_input(req)
     try:
         # Parse input
         if req.numbers:
-            nums = req.numbers
+            nums = [n & 0xFFFFFFFF for n in req.numbers]
+            decoded = codec.parse_message_dict(nums)
+        else:
+            if req.base64:
+                b = b64_frame(req.base64)
+            else:
+                b = bytes.fromhex(req.hex)
+            nums, checksum_ok = decode9(b)
+            decoded = codec.parse_message_dict(nums, checksum_ok, b)
+        
+        # Serialize directly; response_model stays for the OpenAPI schema only
+        return Response(content=json_bytes(decoded), media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/encode_batch", response_model=EncodeBatchResponse)
+def encode_batch(req: EncodeBatchRequest):
+    """Encode many messages into one buffer of concatenated frames."""
+    try:
+        frames, headers = codec.build_batch(req.requests)
+        return EncodeBatchResponse(
+            count=len(headers),
+            numbers=frames.tolist(),
+            base64=b64_str(frames.tobytes()),
+            headers=headers,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/decode_batch", response_model=DecodeBatchResponse)
+def decode_batch(req: DecodeBatchRequest):
+    """Decode many NLC-9 messages at once."""
+    require_one_input(req)
+    try:
+        if req.numbers:
+            if any(len(row) != 9 for row in req.numbers):
+                raise ValueError("Need exactly 9 numbers per message")
+            try:
+                frames = (np.array(req.numbers, dtype=np.int64) & config.UINT32_MASK).astype(">u4")
+            except OverflowError:
+                # Beyond int64: mask limb by limb like /decode does
+                frames = np.array([[u32(n) for n in row] for row in req.numbers], dtype=">u4")
         elif req.base64:
-            b = base64.b64decode(req.base64)
-            nums = unpack9(b)
+            frames = frames_from_bytes(_b64decode(req.base64))
         elif req.hex:
-            b = bytes.fromhex(req.hex)
-            nums = unpack9(b)
+            frames = frames_from_bytes(bytes.fromhex(req.hex))
         else:
             raise ValueError("No input provided")
         
-        return codec.parse_message(nums)
+        if len(frames) > config.MAX_BATCH_SIZE:
+            raise ValueError(f"Batch exceeds {config.MAX_BATCH_SIZE} messages")
+        
+        messages = codec.parse_batch(frames)
+        return DecodeBatchResponse(
+            count=len(messages),
+            checksum_failures=sum(1 for m in messages if not m.checksum_ok),
+            messages=messages,
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/schema/register")
 def register_schema(schema: SchemaRegistration):
     """Register parameter schema for verb/object pair."""
-    verb_id = VERBS.get(schema.verb.upper(), token_id(schema.verb))
-    obj_id = OBJECTS.get(schema.object.upper(), token_id(schema.object))
+    verb_id = id_for_verb(schema.verb)
+    obj_id = id_for_object(schema.object)
     
-    SCHEMAS[(verb_id, obj_id)] = schema
+    install_schema((verb_id, obj_id), schema)
     
     return {
         "status": "registered",
@@ -964,8 +1926,8 @@ def register_schema(schema: SchemaRegistration):
 @app.get("/schema/{verb}/{object}")
 def get_schema(verb: str, object: str):
     """Get schema for verb/object pair."""
-    verb_id = VERBS.get(verb.upper(), token_id(verb))
-    obj_id = OBJECTS.get(object.upper(), token_id(object))
+    verb_id = id_for_verb(verb)
+    obj_id = id_for_object(object)
     
     schema = SCHEMAS.get((verb_id, obj_id))
     if not schema:
@@ -983,12 +1945,10 @@ def get_schema(verb: str, object: str):
 def list_schemas(tag: Optional[str] = None):
     """List all registered schemas."""
     schemas = []
-    for (v_id, o_id), schema in SCHEMAS.items():
-        if tag and (not schema.tags or tag not in schema.tags):
-            continue
+    for (v_id, o_id), schema in (TAG_INDEX.get(tag, {}) if tag else SCHEMAS).items():
         schemas.append({
-            "verb": REV_VERBS.get(v_id, f"VERB#{v_id}"),
-            "object": REV_OBJECTS.get(o_id, f"OBJECT#{o_id}"),
+            "verb": name_for_verb_id(v_id),
+            "object": name_for_object_id(o_id),
             "description": schema.description,
             "tags": schema.tags,
         })
@@ -1004,8 +1964,7 @@ async def broadcast_message(req: EncodeRequest, channel: str = "general"):
             raise HTTPException(status_code=429, detail="Rate limit exceeded")
         
         # Encode message
-        nums, header = codec.build_message(req)
-        b = pack9(nums)
+        nums, header, b = codec.build_message(req)
         
         # Create internal message
         message = Message(
@@ -1017,22 +1976,28 @@ async def broadcast_message(req: EncodeRequest, channel: str = "general"):
             priority=req.priority or 5,
             ttl=req.ttl or 3600,
             sender=client_id,
+            packed=b,
+            cached_base64=b64_str(b),
         )
         
         # Publish to channel
         subscribers = router.publish(channel, message)
         
         # Broadcast via WebSocket
+        # Serialize once per encoding; every subscriber shares the same payload
+        payload = {
+            "type": "broadcast",
+            "channel": channel,
+            "message": {
+                "base64": message.cached_base64,
+                "header": header,
+            }
+        }
         await manager.broadcast(
-            json.dumps({
-                "type": "broadcast",
-                "channel": channel,
-                "message": {
-                    "base64": base64.b64encode(b).decode("ascii"),
-                    "header": header,
-                }
-            }),
-            channel=channel
+            json_dumps(payload),
+            channel=channel,
+            binary=_msgpack.packb(payload) if MSGPACK_AVAILABLE and manager.msgpack_clients else None,
+            frame=b,
         )
         
         return {
@@ -1079,161 +2044,320 @@ def get_consensus_status(action_id: str):
     }
 
 @app.get("/metrics")
-def get_metrics():
-    """Get system metrics."""
+def get_metrics(include_uptime: bool = True):
+    """Get system metrics (``include_uptime=false`` skips per-connection uptimes for cheap scrapes)."""
     return {
         "router": router.get_metrics(),
-        "connections": manager.get_stats(),
+        "connections": manager.get_stats(include_uptime),
         "schemas": len(SCHEMAS),
         "verbs": len(VERBS),
         "objects": len(OBJECTS),
+        # Optional accelerators detected at import
+        "accelerators": {
+            "isal": ISAL_AVAILABLE,
+            "pybase64": PYBASE64_AVAILABLE,
+            "numba": NUMBA_AVAILABLE,
+            "orjson": ORJSON_AVAILABLE,
+            "msgpack": MSGPACK_AVAILABLE,
+        },
     }
 
 # ============================================
 # WEBSOCKET ENDPOINTS
 # ============================================
 
+def _int_field(data: Dict[str, Any], key: str, default: Optional[int] = None) -> Optional[int]:
+    val = data.get(key, default)
+    if val is not None and (type(val) is not int):
+        raise ValueError(f"'{key}' must be an integer")
+    return val
+
+def fast_encode_args(data: Dict[str, Any]) -> Tuple:
+    """Validate a raw encode payload with plain type checks (no Pydantic).
+
+    Returns positional arguments for ``NLC9Codec.build_frame``.
+    """
+    verb = data.get("verb")
+    obj = data.get("object")
+    if not isinstance(verb, str) or not isinstance(obj, str):
+        raise ValueError("'verb' and 'object' are required strings")
+    
+    params = data.get("params")
+    if params is not None:
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be an object")
+        for v in params.values():
+            if v is not None and not isinstance(v, (str, int, float)):
+                raise ValueError("'params' values must be scalars")
+    
+    flags = data.get("flags")
+    if flags is not None and not (isinstance(flags, list) and all(isinstance(f, str) for f in flags)):
+        raise ValueError("'flags' must be a list of strings")
+    
+    domain = data.get("domain")
+    if domain is not None and not isinstance(domain, str):
+        raise ValueError("'domain' must be a string")
+    
+    priority = _int_field(data, "priority", 5)
+    if priority is not None and not (0 <= priority <= 10):
+        raise ValueError("'priority' must be 0..10")
+    
+    return (
+        verb, obj, params, flags, domain,
+        _int_field(data, "timestamp"),
+        _int_field(data, "correlation_id"),
+        priority,
+        _int_field(data, "ttl", 3600),
+    )
+
+def _ws_subscribe(msg: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+    """Subscribe to channel."""
+    channel = msg.get("channel", "general")
+    attach(client_id, channel)
+    return {
+        "type": "subscribed",
+        "channel": channel,
+    }
+
+def _ws_encode(msg: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+    """Encode message (plain type checks, no Pydantic, on the streaming path)."""
+    b, _, header = codec.build_frame(*fast_encode_args(msg.get("data") or {}))
+    return {
+        "type": "encoded",
+        "base64": b64_str(b),
+        "header": header,
+    }
+
+def _ws_decode(msg: Dict[str, Any], client_id: str) -> Optional[Dict[str, Any]]:
+    """Decode message."""
+    if "base64" in msg:
+        b = b64_frame(msg["base64"])
+        nums, checksum_ok = decode9(b)
+        return codec.parse_message_dict(nums, checksum_ok, b)
+    return None
+
+def _ws_heartbeat(msg: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+    """Heartbeat."""
+    return {"type": "heartbeat", "timestamp": time.time()}
+
+# /ws command type -> handler(msg, client_id) returning the reply payload
+WS_COMMANDS: Dict[str, Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]]] = {
+    "subscribe": _ws_subscribe,
+    "encode": _ws_encode,
+    "decode": _ws_decode,
+    "heartbeat": _ws_heartbeat,
+}
+
+def ws_command(msg: Dict[str, Any], client_id: str) -> Optional[Dict[str, Any]]:
+    """Execute one parsed /ws command and return the reply payload."""
+    try:
+        kind = msg.get("type")
+        handler = WS_COMMANDS.get(kind) if isinstance(kind, str) else None
+        if handler is None:
+            return {"error": "Unknown message type"}
+        return handler(msg, client_id)
+    except Exception as e:
+        return {"error": str(e)}
+
+def ws_reply(data: Dict[str, Any], client_id: str, use_msgpack: bool = False) -> Optional[Dict[str, Any]]:
+    """Process one raw /ws frame and return the reply payload (None for no reply).
+
+    In msgpack mode, 36-byte binary frames are NLC-9 messages and any other
+    binary frame is a msgpack-encoded command.
+    """
+    if data.get("type") == "websocket.disconnect":
+        raise WebSocketDisconnect(data.get("code", 1000))
+    
+    raw = data.get("bytes")
+    if raw:
+        if use_msgpack and len(raw) != 36:
+            try:
+                msg = _msgpack.unpackb(raw)
+            except Exception as e:
+                return {"error": f"Invalid msgpack frame: {e}"}
+            return ws_command(msg, client_id)
+        # Binary message - try to decode as NLC-9
+        try:
+            nums, checksum_ok = decode9(raw)
+            return codec.parse_message_dict(nums, checksum_ok, raw)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    if data.get("text"):
+        # Text message - parse as JSON command
+        try:
+            msg = json_loads(data["text"])
+        except Exception as e:
+            return {"error": str(e)}
+        return ws_command(msg, client_id)
+    
+    return None
+
+async def drain_ws(websocket: WebSocket, max_n: int = 64, max_wait: float = 0.001) -> List[Dict[str, Any]]:
+    """Wait for one frame, then collect any burst arriving within max_wait seconds."""
+    frames = [await websocket.receive()]
+    while len(frames) < max_n and frames[-1].get("type") != "websocket.disconnect":
+        try:
+            frames.append(await asyncio.wait_for(websocket.receive(), timeout=max_wait))
+        except asyncio.TimeoutError:
+            break
+    return frames
+
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """Main WebSocket endpoint for bidirectional communication."""
+async def websocket_endpoint(websocket: WebSocket, batch: bool = False):
+    """Main WebSocket endpoint for bidirectional communication.
+
+    With ``?batch=1`` bursts of frames are processed together and answered
+    with a single array of replies. Clients offering the ``nlc9.msgpack``
+    subprotocol get msgpack binary replies instead of JSON text.
+    """
     client_id = f"ws_{secrets.token_hex(8)}"
-    await manager.connect(client_id, websocket)
+    use_msgpack = MSGPACK_AVAILABLE and WS_MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await manager.connect(client_id, websocket, subprotocol=WS_MSGPACK_SUBPROTOCOL if use_msgpack else None)
+    
+    async def send(payload: Any) -> None:
+        await manager.send(client_id, _msgpack.packb(payload) if use_msgpack else json_dumps(payload))
     
     try:
         while True:
-            # Receive message
-            data = await websocket.receive()
-            
-            if "bytes" in data and data["bytes"]:
-                # Binary message - try to decode as NLC-9
-                try:
-                    nums = unpack9(data["bytes"])
-                    response = codec.parse_message(nums)
-                    await websocket.send_json(response.dict())
-                except Exception as e:
-                    await websocket.send_json({"error": str(e)})
-            
-            elif "text" in data and data["text"]:
-                # Text message - parse as JSON command
-                try:
-                    msg = json.loads(data["text"])
-                    
-                    if msg.get("type") == "subscribe":
-                        # Subscribe to channel
-                        channel = msg.get("channel", "general")
-                        router.subscribe(channel, client_id)
-                        manager.join_channel(client_id, channel)
-                        await websocket.send_json({
-                            "type": "subscribed",
-                            "channel": channel,
-                        })
-                    
-                    elif msg.get("type") == "encode":
-                        # Encode message
-                        req = EncodeRequest(**msg.get("data", {}))
-                        nums, header = codec.build_message(req)
-                        b = pack9(nums)
-                        await websocket.send_json({
-                            "type": "encoded",
-                            "base64": base64.b64encode(b).decode("ascii"),
-                            "header": header,
-                        })
-                    
-                    elif msg.get("type") == "decode":
-                        # Decode message
-                        if "base64" in msg:
-                            b = base64.b64decode(msg["base64"])
-                            nums = unpack9(b)
-                            response = codec.parse_message(nums)
-                            await websocket.send_json(response.dict())
-                    
-                    elif msg.get("type") == "heartbeat":
-                        # Heartbeat
-                        await websocket.send_json({"type": "heartbeat", "timestamp": time.time()})
-                    
-                    else:
-                        await websocket.send_json({"error": "Unknown message type"})
-                        
-                except Exception as e:
-                    await websocket.send_json({"error": str(e)})
+            if batch:
+                replies = []
+                for data in await drain_ws(websocket):
+                    reply = ws_reply(data, client_id, use_msgpack)
+                    if reply is not None:
+                        replies.append(reply)
+                if replies:
+                    await send(replies)
+            else:
+                reply = ws_reply(await websocket.receive(), client_id, use_msgpack)
+                if reply is not None:
+                    await send(reply)
     
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit releases the sender, outbox, channels and router queue
         manager.disconnect(client_id)
-        router.unsubscribe("general", client_id)
+        detach_all(client_id, drop_queue=True)
 
 @app.websocket("/ws/agent/{agent_id}")
 async def agent_websocket(websocket: WebSocket, agent_id: str):
-    """Dedicated WebSocket endpoint for agents."""
-    await manager.connect(agent_id, websocket, {"type": "agent"})
+    """Dedicated WebSocket endpoint for agents.
+
+    Agents offering the ``nlc9.binary`` subprotocol get queued messages and
+    heartbeats as binary frames tagged with a type byte (BIN_MESSAGE + frame,
+    a ``pack_frames_batch`` BIN_BATCH, BIN_HEARTBEAT; live channel pushes are
+    BIN_BROADCAST + frame) instead of JSON;
+    other control messages stay JSON.
+    """
+    binary = WS_BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await manager.connect(agent_id, websocket, {"type": "agent"},
+                          subprotocol=WS_BINARY_SUBPROTOCOL if binary else None)
+    recv_task = None
+    waiter = None
     
     try:
         # Auto-subscribe to agent channels
-        router.subscribe("agents", agent_id)
-        router.subscribe(f"agent:{agent_id}", agent_id)
-        manager.join_channel(agent_id, "agents")
+        attach(agent_id, "agents")
+        attach(agent_id, f"agent:{agent_id}", push=False)
         
-        await websocket.send_json({
+        await manager.send(agent_id, json_dumps({
             "type": "connected",
             "agent_id": agent_id,
             "channels": ["agents", f"agent:{agent_id}"],
-        })
+        }))
+        
+        # Heartbeats run on their own timer; the loop below only wakes for an
+        # incoming frame or a publish into our queue
+        manager.start_heartbeat(agent_id, BIN_HEARTBEAT if binary else JSON_HEARTBEAT)
         
         while True:
             # Check for queued messages
-            messages = router.get_messages(agent_id, limit=10)
-            for msg in messages:
-                await websocket.send_json({
-                    "type": "message",
-                    "message": {
-                        "id": msg.id,
-                        "base64": base64.b64encode(pack9(msg.numbers)).decode("ascii"),
-                        "header": msg.header,
-                        "decoded": msg.decoded,
-                    }
-                })
+            messages = router.drain(agent_id)
+            if binary:
+                # One binary frame for the whole drain
+                if len(messages) == 1:
+                    await manager.send(agent_id, BIN_MESSAGE + messages[0].frame())
+                elif messages:
+                    await manager.send(agent_id, pack_frames_batch([msg.frame() for msg in messages]))
+            else:
+                for msg in messages:
+                    await manager.send(agent_id, msg.agent_envelope())
+            
+            if recv_task is None:
+                recv_task = asyncio.create_task(websocket.receive())
+            if waiter is None or waiter.done():
+                waiter = router.message_waiter(agent_id)
+            done, _ = await asyncio.wait({recv_task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if recv_task not in done:
+                continue
             
             # Handle incoming messages
-            try:
-                data = await asyncio.wait_for(websocket.receive(), timeout=1.0)
+            data = recv_task.result()
+            recv_task = None
+            if data.get("type") == "websocket.disconnect":
+                raise WebSocketDisconnect(data.get("code", 1000))
+            
+            if data.get("text"):
+                msg = json_loads(data["text"])
                 
-                if "text" in data:
-                    msg = json.loads(data["text"])
-                    
-                    # Process agent commands
-                    if msg.get("type") == "signal":
-                        # Agent broadcasting signal
-                        await broadcast_message(
-                            EncodeRequest(
-                                verb="SIGNAL",
-                                object="MARKET",
-                                params=msg.get("params"),
-                                flags=["BROADCAST", "URGENT"],
-                                domain=f"agent.{agent_id}",
-                            ),
-                            channel="signals"
-                        )
-                    
-                    elif msg.get("type") == "vote":
-                        # Agent voting
-                        submit_consensus_vote(
-                            msg["action_id"],
-                            agent_id,
-                            msg["vote"]
-                        )
-                    
-            except asyncio.TimeoutError:
-                # Send heartbeat
-                await websocket.send_json({"type": "heartbeat"})
+                # Process agent commands
+                if msg.get("type") == "signal":
+                    # Agent broadcasting signal
+                    await broadcast_message(
+                        _ENCODE_REQ_ADAPTER.validate_python({
+                            "verb": "SIGNAL",
+                            "object": "MARKET",
+                            "params": msg.get("params"),
+                            "flags": ["BROADCAST", "URGENT"],
+                            "domain": f"agent.{agent_id}",
+                        }),
+                        channel="signals"
+                    )
+                
+                elif msg.get("type") == "vote":
+                    # Agent voting
+                    submit_consensus_vote(
+                        msg["action_id"],
+                        agent_id,
+                        msg["vote"]
+                    )
                 
     except WebSocketDisconnect:
-        manager.disconnect(agent_id)
-        router.unsubscribe("agents", agent_id)
-        router.unsubscribe(f"agent:{agent_id}", agent_id)
+        pass
+    finally:
+        # Any exit releases the receive task and waiter; the heartbeat timer,
+        # sender and subscriptions too, unless the agent id already
+        # reconnected elsewhere
+        if recv_task is not None:
+            recv_task.cancel()
+        router.drop_waiter(agent_id, waiter)
+        current = manager.active_connections.get(agent_id)
+        if current is None or current is websocket:
+            manager.disconnect(agent_id)
+            detach_all(agent_id)
 
 # ============================================
 # TRADING-SPECIFIC ENDPOINTS
 # ============================================
 
+# Constant request fields per endpoint; handlers only add params (and domain)
+_SIGNAL_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    signal_type: {
+        "verb": "SIGNAL",
+        "object": "MARKET",
+        "flags": ["BROADCAST", "URGENT"] if signal_type in ("BUY", "SELL") else ["BROADCAST"],
+        "domain": "trading.signals",
+    }
+    for signal_type in ("BUY", "SELL", "HOLD", "ALERT")
+}
+
+_EXECUTE_TEMPLATE: Dict[str, Any] = {
+    "verb": "EXEC",
+    "object": "ORDER",  # Fixed: use ORDER instead of TRADE
+    "flags": ["ACK", "URGENT"],
+}
+
 @app.post("/trading/signal")
 async def send_trading_signal(
     signal_type: Literal["BUY", "SELL", "HOLD", "ALERT"],
@@ -1243,17 +2367,14 @@ async def send_trading_signal(
     metadata: Optional[Dict] = None
 ):
     """Send trading signal to all agents."""
-    req = EncodeRequest(
-        verb="SIGNAL",
-        object="MARKET",
-        params={
+    req = _ENCODE_REQ_ADAPTER.validate_python({
+        **_SIGNAL_TEMPLATES[signal_type],
+        "params": {
             "strength": strength,
             "confidence": confidence,
             "token_id": token,
         },
-        flags=["BROADCAST", "URGENT"] if signal_type in ["BUY", "SELL"] else ["BROADCAST"],
-        domain="trading.signals",
-    )
+    })
     
     result = await broadcast_message(req, channel="trading_signals")
     
@@ -1269,32 +2390,29 @@ async def send_trading_signal(
     }
 
 @app.post("/trading/execute")
-def execute_trade(
+async def execute_trade(
     pool_id: str,
     amount: float,
     slippage_bps: int = 50,
     agent_id: Optional[str] = None
 ):
-    """Execute trade order."""
-    req = EncodeRequest(
-        verb="EXEC",
-        object="ORDER",  # Fixed: use ORDER instead of TRADE
-        params={
+    """Execute trade order (encoding takes microseconds, so it stays on the event loop)."""
+    req = _ENCODE_REQ_ADAPTER.validate_python({
+        **_EXECUTE_TEMPLATE,
+        "params": {
             "pool_id": pool_id,
             "amount": amount,
             "slippage": slippage_bps,
         },
-        flags=["ACK", "URGENT"],
-        domain=f"agent.{agent_id}" if agent_id else "trading",
-    )
+        "domain": f"agent.{agent_id}" if agent_id else "trading",
+    })
     
-    nums, header = codec.build_message(req)
-    b = pack9(nums)
+    nums, header, b = codec.build_message(req)
     
     return {
         "status": "trade_queued",
         "message": {
-            "base64": base64.b64encode(b).decode("ascii"),
+            "base64": b64_str(b),
             "header": header,
         },
         "trade": {
@@ -1307,16 +2425,19 @@ def execute_trade(
 @app.get("/trading/schemas")
 def get_trading_schemas():
     """Get all trading-related schemas."""
-    trading_schemas = []
-    for (v_id, o_id), schema in SCHEMAS.items():
-        if schema.tags and "trading" in schema.tags:
-            trading_schemas.append({
-                "verb": REV_VERBS.get(v_id, f"VERB#{v_id}"),
-                "object": REV_OBJECTS.get(o_id, f"OBJECT#{o_id}"),
+    body = _TAG_RESPONSE_CACHE.get("trading")
+    if body is None:
+        body = json_bytes({"schemas": [
+            {
+                "verb": name_for_verb_id(v_id),
+                "object": name_for_object_id(o_id),
                 "params": [p.dict() for p in schema.params],
                 "description": schema.description,
-            })
-    return {"schemas": trading_schemas}
+            }
+            for (v_id, o_id), schema in TAG_INDEX.get("trading", {}).items()
+        ]})
+        _TAG_RESPONSE_CACHE["trading"] = body
+    return Response(content=body, media_type="application/json")
 
 # ============================================
 # MAIN ENTRY POINT
@@ -1329,4 +2450,7 @@ if __name__ == "__main__":
         port=int(os.getenv("NLC9_PORT", "8000")),
         reload=config.DEBUG_MODE,
         log_level=os.getenv("NLC9_LOG_LEVEL", "info"),
+        # loop/http "auto" already pick uvloop/httptools from uvicorn[standard]
+        ws="websockets",
+        ws_per_message_deflate=config.WS_PER_MESSAGE_DEFLATE,
     )
\ No newline at end of file
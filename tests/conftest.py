@@ -0,0 +1,32 @@
+"""Shared fixtures: load ``src/nlc9-api.py`` (not importable by name) and a test client."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+API_PATH = Path(__file__).resolve().parent.parent / "src" / "nlc9-api.py"
+
+
+def _load_api():
+    spec = importlib.util.spec_from_file_location("nlc9-api", API_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Same module name uvicorn uses ("nlc9-api:app"); registered before exec
+    # so dataclasses (and numba's on-disk kernel cache) can resolve it
+    sys.modules["nlc9-api"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def api():
+    return sys.modules.get("nlc9-api") or _load_api()
+
+
+@pytest.fixture
+def client(api):
+    # Context manager runs the startup hook (trading schemas)
+    with TestClient(api.app) as c:
+        yield c
@@ -0,0 +1,63 @@
+"""/encode_batch and /decode_batch against the single-message endpoints."""
+
+import base64
+
+REQUESTS = [
+    {
+        "verb": "EXEC",
+        "object": "ORDER",
+        "params": {"pool_id": "p1", "amount": 12.5, "slippage": 50},
+        "flags": ["ACK"],
+        "timestamp": 1700000001,
+        "correlation_id": 7,
+    },
+    {
+        "verb": "frob",
+        "object": "widget",
+        "params": {"z": 1, "a": True, "m": 2.5},
+        "timestamp": 3,
+        "correlation_id": 9,
+    },
+]
+
+
+def test_encode_batch_rows_match_single_encode(client):
+    batch = client.post("/encode_batch", json={"requests": REQUESTS}).json()
+    singles = [client.post("/encode", json=req).json() for req in REQUESTS]
+
+    assert batch["count"] == len(REQUESTS)
+    assert batch["numbers"] == [s["numbers"] for s in singles]
+    assert batch["headers"] == [s["header"] for s in singles]
+    raw = base64.b64decode(batch["base64"])
+    assert [raw[i:i + 36] for i in range(0, len(raw), 36)] == [base64.b64decode(s["base64"]) for s in singles]
+
+
+def test_decode_batch_matches_single_decode(client):
+    batch = client.post("/encode_batch", json={"requests": REQUESTS}).json()
+    decoded = client.post("/decode_batch", json={"base64": batch["base64"]}).json()
+
+    assert decoded["count"] == len(REQUESTS)
+    assert decoded["checksum_failures"] == 0
+    for message, nums in zip(decoded["messages"], batch["numbers"]):
+        assert message == client.post("/decode", json={"numbers": nums}).json()
+
+
+def test_decode_batch_flags_corrupted_rows(client):
+    batch = client.post("/encode_batch", json={"requests": REQUESTS}).json()
+    rows = [row[:] for row in batch["numbers"]]
+    rows[1][3] ^= 1
+
+    decoded = client.post("/decode_batch", json={"numbers": rows}).json()
+
+    assert decoded["checksum_failures"] == 1
+    assert [m["checksum_ok"] for m in decoded["messages"]] == [True, False]
+
+
+def test_decode_batch_rejects_partial_frames(client):
+    resp = client.post("/decode_batch", json={"hex": "00" * 35})
+    assert resp.status_code == 400
+
+
+def test_decode_batch_requires_exactly_one_input(client):
+    resp = client.post("/decode_batch", json={})
+    assert resp.status_code == 422
@@ -0,0 +1,99 @@
+"""MessageRouter bookkeeping: rate limiting, consensus tallies and queue drains."""
+
+import time
+from collections import Counter
+
+import pytest
+
+
+@pytest.fixture
+def router(api):
+    return api.MessageRouter()
+
+
+def test_rate_limit_allows_up_to_limit(api, router, monkeypatch):
+    monkeypatch.setattr(api.config, "RATE_LIMIT_MESSAGES", 2)
+    assert router.check_rate_limit("c1")
+    assert router.check_rate_limit("c1")
+    assert not router.check_rate_limit("c1")
+    assert router.check_rate_limit("c2")
+
+
+def test_rate_limit_sweeps_idle_clients_once_per_window(api, router):
+    stale = time.time() - api.config.RATE_LIMIT_WINDOW - 1
+    router.rate_limits["idle"].append(stale)
+
+    assert router.check_rate_limit("busy")
+    assert "idle" not in router.rate_limits
+    assert router._rate_sweep_at > time.time()
+
+    # Next sweep is a window away; stale entries wait until then
+    router.rate_limits["idle"].append(stale)
+    assert router.check_rate_limit("busy")
+    assert "idle" in router.rate_limits
+
+    router._rate_sweep_at = 0.0
+    assert router.check_rate_limit("busy")
+    assert set(router.rate_limits) == {"busy"}
+
+
+def _recount(router, action_id):
+    return Counter(router.consensus_voter_keys[action_id].values())
+
+
+def test_consensus_tallies_follow_changed_votes(router):
+    router.add_consensus_vote("a1", "v1", "buy")
+    router.add_consensus_vote("a1", "v2", "buy")
+    router.add_consensus_vote("a1", "v3", "sell")
+    assert router.check_consensus("a1", threshold=0.6) == "buy"
+
+    # v2 switches sides: the leader loses a vote and "sell" takes over
+    router.add_consensus_vote("a1", "v2", "sell")
+    assert router.check_consensus("a1", threshold=0.6) == "sell"
+    assert router.consensus_tallies["a1"] == _recount(router, "a1")
+    assert router.consensus_leader["a1"][1] == 2
+
+    # Repeating a vote changes nothing
+    router.add_consensus_vote("a1", "v3", "sell")
+    assert router.consensus_tallies["a1"] == _recount(router, "a1")
+    assert router.check_consensus("a1", threshold=0.7) is None
+
+
+def test_consensus_tallies_equal_votes_by_canonical_key(router):
+    router.add_consensus_vote("a2", "v1", {"side": "buy", "size": 1})
+    router.add_consensus_vote("a2", "v2", {"size": 1, "side": "buy"})
+    assert len(router.consensus_tallies["a2"]) == 1
+    assert router.check_consensus("a2", threshold=1.0) == {"side": "buy", "size": 1}
+
+
+def test_consensus_evicts_oldest_action(api, router, monkeypatch):
+    monkeypatch.setattr(api.config, "MAX_CONSENSUS_ITEMS", 2)
+    for action_id in ("old", "mid", "new"):
+        router.add_consensus_vote(action_id, "v1", "yes")
+
+    assert list(router.consensus_votes) == ["mid", "new"]
+    assert "old" not in router.consensus_tallies
+    assert "old" not in router.consensus_leader
+    assert router.check_consensus("old", threshold=0.5) is None
+
+
+def _message(api, message_id, age, ttl=60):
+    return api.Message(
+        id=message_id, numbers=[0] * 9, header={}, decoded={},
+        timestamp=time.time() - age, priority=5, ttl=ttl,
+    )
+
+
+def test_drain_swaps_queue_and_drops_expired(api, router):
+    queue = router.queues["sub"]
+    queue.extend([_message(api, "live-1", 0), _message(api, "stale", 120), _message(api, "live-2", 0)])
+
+    assert [m.id for m in router.drain("sub")] == ["live-1", "live-2"]
+    fresh = router.queues["sub"]
+    assert fresh is not queue
+    assert not fresh and fresh.maxlen == queue.maxlen
+
+
+def test_drain_empty_queue_creates_nothing(router):
+    assert router.drain("nobody") == []
+    assert "nobody" not in router.queues
@@ -0,0 +1,75 @@
+"""Schema registration: generated codecs, cache invalidation and the tag index."""
+
+import pytest
+
+
+def _schema(api, verb="TUNE", object="KNOB", scale=1000, tags=None):
+    return api.SchemaRegistration(
+        verb=verb,
+        object=object,
+        tags=tags,
+        params=[
+            api.ParamSpec(name="level", type="percent", max_value=10000),
+            api.ParamSpec(name="gain", type="float", scale=scale),
+            api.ParamSpec(name="on", type="bool", required=False),
+        ],
+    )
+
+
+def _register(api, schema):
+    key = (api.id_for_verb(schema.verb), api.id_for_object(schema.object))
+    api.install_schema(key, schema)
+    return key
+
+
+def test_codegen_encoder_and_decoder_round_trip(api):
+    enc, dec = api.codegen_schema(api.compile_schema(_schema(api)))
+    assert enc({"level": 0.25, "gain": 1.5, "on": True}) == (2500, 1500, 1)
+    assert enc({"level": 0.25, "gain": 1.5}) == (2500, 1500, 0)
+    assert dec(2500, 1500, 1) == {"level": 0.25, "gain": 1.5, "on": True}
+
+
+def test_codegen_encoder_checks_required_and_bounds(api):
+    enc, _ = api.codegen_schema(api.compile_schema(_schema(api)))
+    with pytest.raises(ValueError, match="'level' missing"):
+        enc({"gain": 1.5})
+    # Bounds apply to the encoded slot value (level 1.5 -> 15000)
+    with pytest.raises(ValueError, match="'level' above maximum"):
+        enc({"level": 1.5, "gain": 1.5})
+
+
+def test_registered_schema_codec_used_by_endpoints(api, client):
+    key = _register(api, _schema(api, verb="TUNE_EP"))
+    assert key in api._SCHEMA_ENC_FN and key in api._SCHEMA_DEC_FN
+
+    params = {"level": 0.25, "gain": 1.5, "on": True}
+    encoded = client.post("/encode", json={"verb": "TUNE_EP", "object": "KNOB", "params": params}).json()
+    assert encoded["numbers"][3:6] == [2500, 1500, 1]
+    decoded = client.post("/decode", json={"base64": encoded["base64"]}).json()
+    assert decoded["decoded"]["params"] == params
+
+
+def test_install_schema_invalidates_static_limbs(api, client):
+    request = {"verb": "TUNE_CACHE", "object": "KNOB", "params": {"level": 0.5, "gain": 1.5}}
+    _register(api, _schema(api, verb="TUNE_CACHE", scale=1000))
+    assert client.post("/encode", json=request).json()["numbers"][4] == 1500
+    assert api._static_limbs_cached.cache_info().currsize
+
+    _register(api, _schema(api, verb="TUNE_CACHE", scale=100))
+    assert api._static_limbs_cached.cache_info().currsize == 0
+    assert client.post("/encode", json=request).json()["numbers"][4] == 150
+
+
+def test_reregistration_moves_schema_between_tags(api, client):
+    key = _register(api, _schema(api, verb="TUNE_TAG", tags=["trading"]))
+    assert key in api.TAG_INDEX["trading"]
+    listed = {s["verb"] for s in client.get("/trading/schemas").json()["schemas"]}
+    assert api.name_for_verb_id(key[0]) in listed
+
+    _register(api, _schema(api, verb="TUNE_TAG", tags=["probe"]))
+    assert key not in api.TAG_INDEX["trading"]
+    assert api.TAG_INDEX["probe"][key].tags == ["probe"]
+    # The cached /trading/schemas body is rebuilt without it
+    listed = {s["verb"] for s in client.get("/trading/schemas").json()["schemas"]}
+    assert api.name_for_verb_id(key[0]) not in listed
+    assert client.get("/schemas", params={"tag": "probe"}).json()["count"] >= 1
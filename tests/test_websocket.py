@@ -0,0 +1,132 @@
+"""WebSocket delivery: agent endpoints, subprotocols, outboxes and teardown."""
+
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+
+PING = {"verb": "PING", "object": "AGENT", "timestamp": 1, "correlation_id": 4242}
+
+
+@pytest.fixture
+def fast_heartbeat(api, monkeypatch):
+    monkeypatch.setattr(api.config, "WEBSOCKET_HEARTBEAT", 0.2)
+
+
+def _wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_binary_agent_gets_live_and_queued_copy_once(api, client, fast_heartbeat):
+    with client.websocket_connect("/ws/agent/bin-1", subprotocols=["nlc9.binary"]) as ws:
+        assert ws.accepted_subprotocol == "nlc9.binary"
+        assert ws.receive_json()["type"] == "connected"
+
+        client.post("/broadcast", params={"channel": "agents"}, json=PING)
+        frame = base64.b64decode(client.post("/encode", json=PING).json()["base64"])
+
+        received = [ws.receive_bytes(), ws.receive_bytes()]
+        assert sorted(r[:1] for r in received) == [api.BIN_MESSAGE, api.BIN_BROADCAST]
+        assert all(r[1:] == frame for r in received)
+        # Next frame is the heartbeat: no duplicate delivery in between
+        assert ws.receive_bytes() == api.BIN_HEARTBEAT
+
+
+def test_binary_agent_batches_backlog(api, client):
+    nums, header, frame = api.codec.build_message(api.EncodeRequest(**PING))
+    now = time.time()
+    for i in range(3):
+        api.router.queues["bin-2"].append(api.Message(
+            id=str(i), numbers=nums, header=header, decoded={},
+            timestamp=now, priority=5, ttl=60, packed=frame,
+        ))
+
+    with client.websocket_connect("/ws/agent/bin-2", subprotocols=["nlc9.binary"]) as ws:
+        ws.receive_json()
+        assert ws.receive_bytes() == api.pack_frames_batch([frame] * 3)
+
+
+def test_json_agent_gets_broadcast_then_message(client, fast_heartbeat):
+    with client.websocket_connect("/ws/agent/json-1") as ws:
+        assert ws.receive_json()["type"] == "connected"
+        client.post("/broadcast", params={"channel": "agents"}, json=PING)
+
+        kinds = sorted(ws.receive_json()["type"] for _ in range(2))
+        assert kinds == ["broadcast", "message"]
+        assert ws.receive_json() == {"type": "heartbeat"}
+
+
+def test_agent_teardown_releases_everything(api, client):
+    with pytest.raises(json.JSONDecodeError):
+        with client.websocket_connect("/ws/agent/bad-1") as ws:
+            ws.receive_json()
+            ws.send_text("{not json")
+            ws.receive_text()
+
+    assert _wait_for(lambda: "bad-1" not in api.manager.active_connections)
+    assert "bad-1" not in api.manager.heartbeats
+    assert "bad-1" not in api.manager.senders
+    assert all("bad-1" not in subs for subs in api.router.subscriptions.values())
+
+
+def test_ws_subscriptions_detached_on_close(api, client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "subscribe", "channel": "test-detach"})
+        assert ws.receive_json() == {"type": "subscribed", "channel": "test-detach"}
+        assert api.router.subscriptions["test-detach"]
+
+    assert _wait_for(lambda: "test-detach" not in api.router.subscriptions)
+
+
+def test_ws_unknown_command(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "nope"})
+        assert ws.receive_json() == {"error": "Unknown message type"}
+
+
+def test_msgpack_subprotocol_round_trip(api, client):
+    if not api.MSGPACK_AVAILABLE:
+        pytest.skip("msgpack not installed")
+    with client.websocket_connect("/ws", subprotocols=["nlc9.msgpack"]) as ws:
+        assert ws.accepted_subprotocol == "nlc9.msgpack"
+        ws.send_bytes(api._msgpack.packb({"type": "encode", "data": PING}))
+        reply = api._msgpack.unpackb(ws.receive_bytes())
+        assert reply["type"] == "encoded"
+        assert reply["base64"] == client.post("/encode", json=PING).json()["base64"]
+
+
+def test_outbox_push_respects_limit(api):
+    outbox = api.Outbox(2)
+    assert outbox.push("a") and outbox.push(b"b")
+    assert not outbox.push("c")
+    assert list(outbox.pending) == ["a", b"b"]
+
+
+def test_outbox_put_waits_for_sender(api):
+    async def scenario():
+        outbox = api.Outbox(1)
+        sent = []
+
+        async def sender():
+            while True:
+                await outbox.wait()
+                while outbox.pending:
+                    payload = outbox.pending.popleft()
+                    if isinstance(payload, asyncio.Future):
+                        payload.set_result(None)
+                    else:
+                        sent.append(payload)
+
+        task = asyncio.create_task(sender())
+        outbox.push("pushed")
+        # put() goes past the push limit and returns once its payload is out
+        await asyncio.wait_for(outbox.put("reply"), timeout=1)
+        task.cancel()
+        return sent
+
+    assert asyncio.run(scenario()) == ["pushed", "reply"]
@@ -0,0 +1,73 @@
+"""Wire helpers: frames, the nlc9.binary batch envelope and the batch CRC kernel."""
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+
+def _frames(api, n):
+    return [
+        api.codec.build_frame("PING", "AGENT", {"seq": i}, None, None, 1700000000 + i, i)[0]
+        for i in range(n)
+    ]
+
+
+def test_decode9_round_trips_and_checks_crc(api):
+    frame = _frames(api, 1)[0]
+    nums, ok = api.decode9(frame)
+    assert ok
+    assert api.pack9(nums) == frame
+    assert nums[8] == zlib.crc32(frame[:32] + bytes(4))
+
+    corrupted = bytearray(frame)
+    corrupted[12] ^= 0xFF
+    assert api.decode9(bytes(corrupted))[1] is False
+
+
+def test_pack_frames_batch_envelope(api):
+    frames = _frames(api, 3)
+    payload = api.pack_frames_batch(frames)
+
+    assert payload[:1] == api.BIN_BATCH
+    (count,) = struct.unpack_from(">H", payload, 1)
+    assert count == 3
+    offset, parsed = 3, []
+    for _ in range(count):
+        (length,) = struct.unpack_from(">H", payload, offset)
+        parsed.append(payload[offset + 2:offset + 2 + length])
+        offset += 2 + length
+    assert offset == len(payload)
+    assert parsed == frames
+
+
+def test_pack_frames_batch_empty(api):
+    assert api.pack_frames_batch([]) == api.BIN_BATCH + b"\x00\x00"
+
+
+def _zeroed_rows(api, n):
+    rows = api.frames_from_bytes(b"".join(_frames(api, n))).copy()
+    rows[:, 8] = 0
+    return rows
+
+
+def _zlib_crcs(rows):
+    raw = rows.astype(">u4").tobytes()
+    return [zlib.crc32(raw[i:i + 36]) for i in range(0, len(raw), 36)]
+
+
+def test_crc32_frames_matches_zlib(api):
+    rows = _zeroed_rows(api, 17)
+    assert api.crc32_frames(rows).tolist() == _zlib_crcs(rows)
+
+
+def test_numba_crc_kernel_matches_zlib(api):
+    if not api.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    rows = _zeroed_rows(api, 17)
+    wire = np.ascontiguousarray(rows, dtype=">u4").view(np.uint8).reshape(-1, 36)
+    assert api._crc32_rows_jit(wire, api._CRC32_TABLES).tolist() == _zlib_crcs(rows)
+    # Tail loop (lengths that are not a multiple of 8)
+    raw = wire[:, :29].copy()
+    assert api._crc32_rows_jit(raw, api._CRC32_TABLES).tolist() == [zlib.crc32(r.tobytes()) for r in raw]